@@ -0,0 +1,116 @@
+# Step benchmarks: run the steps of the BDD flow (modules/search_flow.py) many
+# times against the local stand-in storefront and compare their latency with the baselines in
+# Config.BENCHMARK_BASELINE_FILE. A step whose median regresses past Config.BENCHMARK_REGRESSION_THRESHOLD
+# (and by at least Config.BENCHMARK_MIN_REGRESSION_S) fails the run, so a new fixed sleep or a slow
+# locator cannot get in unnoticed. The median is gated rather than the p95, which over a few dozen
+# samples is set by one or two outliers. A step without a baseline fails too: record one first.
+#
+# pytest benchmarks
+# BENCH_ITERATIONS=100 pytest benchmarks
+# BENCH_UPDATE_BASELINE=true pytest benchmarks   -> store the current results as the baseline (commit it)
+
+import json
+import logging
+import os
+import statistics
+import time
+
+import pytest
+from playwright.sync_api import Playwright
+
+from config.config import Config
+from modules.request_tracker import RequestTracker
+from modules.storefront import Storefront
+from modules import search_flow as steps
+
+logger = logging.getLogger()
+
+PRODUCTS = ["iPhone 16 Pro", "MacBook Pro"]
+
+
+def percentiles(samples):
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": round(statistics.median(samples), 4), "p95": round(cuts[94], 4), "max": round(max(samples), 4)}
+
+
+def load_baseline():
+    if not os.path.exists(Config.BENCHMARK_BASELINE_FILE):
+        return {}
+    with open(Config.BENCHMARK_BASELINE_FILE) as f:
+        return json.load(f)
+
+
+def save_baseline(results):
+    baseline = load_baseline()
+    baseline.update(results)
+    with open(Config.BENCHMARK_BASELINE_FILE, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+@pytest.fixture(scope="session")
+def storefront(tmp_path_factory):
+    # Point the flows at the stand-in and keep benchmark screenshots and latencies out of the real ones
+    bench_dir = tmp_path_factory.mktemp("bench")
+    with Storefront() as url, pytest.MonkeyPatch.context() as patch:
+        patch.setattr(Config, "HOMEPAGE_URL", url)
+        patch.setattr(Config, "SCREENSHOT_DIR", str(bench_dir / "screenshots"))
+        patch.setattr(Config, "READINESS_LATENCY_FILE", str(bench_dir / "readiness_latencies.json"))
+        yield url
+
+
+@pytest.fixture(scope="session")
+def bench_page(playwright: Playwright, storefront):
+    browser = playwright.chromium.launch(headless=True)
+    context = browser.new_context(viewport=Config.VIEWPORT)
+    page = context.new_page()
+    yield page
+    context.close()
+    browser.close()
+
+
+def run_flow(page, tracker, product, samples):
+    flow = [
+        ("visit_apple_com", lambda: steps.visit_apple_com(page, tracker)),
+        ("search_for_product", lambda: steps.search_for_product(page, tracker, product)),
+        ("add_product_to_bag", lambda: steps.add_product_to_bag(page, product)),
+        ("proceed_to_review_bag", lambda: steps.proceed_to_review_bag(page, tracker)),
+        ("remove_product_from_bag", lambda: steps.remove_product_from_bag(page, product)),
+        ("return_to_homepage", lambda: steps.return_to_homepage(page, tracker)),
+    ]
+    for name, step in flow:
+        start = time.perf_counter()
+        step()
+        samples.setdefault(f"{name}[{product}]", []).append(time.perf_counter() - start)
+
+
+@pytest.mark.parametrize("product", PRODUCTS)
+def test_step_latency(bench_page, product):
+    iterations = int(os.getenv('BENCH_ITERATIONS', Config.BENCHMARK_ITERATIONS))
+    tracker = RequestTracker(bench_page)
+    samples = {}
+    for _ in range(iterations):
+        run_flow(bench_page, tracker, product, samples)
+
+    results = {step: percentiles(values) for step, values in samples.items()}
+    baseline = load_baseline()
+    regressions = []
+    for step, result in results.items():
+        previous = baseline.get(step)
+        if not previous:
+            note = " (no baseline)"
+            regressions.append(f"{step}: no baseline in {Config.BENCHMARK_BASELINE_FILE}, "
+                               f"record one with BENCH_UPDATE_BASELINE=true")
+        else:
+            slower = result["p50"] - previous["p50"]
+            change = slower / previous["p50"] if previous["p50"] else 0.0
+            note = f" (baseline p50 {previous['p50'] * 1000:.0f}ms, {change:+.0%})"
+            if change > Config.BENCHMARK_REGRESSION_THRESHOLD and slower > Config.BENCHMARK_MIN_REGRESSION_S:
+                regressions.append(f"{step}: p50 {result['p50'] * 1000:.0f}ms{note}")
+        logger.info(f"{step}: p50 {result['p50'] * 1000:.0f}ms, p95 {result['p95'] * 1000:.0f}ms, "
+                    f"max {result['max'] * 1000:.0f}ms{note}")
+
+    if os.getenv('BENCH_UPDATE_BASELINE', 'false').lower() == 'true':
+        save_baseline(results)
+        logger.info(f"Baseline updated in {Config.BENCHMARK_BASELINE_FILE}.")
+        return
+    assert not regressions, "Steps slower than their baseline, or without one:\n" + "\n".join(regressions)
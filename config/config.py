@@ -1,5 +1,153 @@
 class Config:
 
     HOMEPAGE_URL = "https://www.apple.com/"
-    PRODUCT_NAME = ["MacBook Pro", "iPhone 16 Pro Max"]
+    CATALOG_FILE = "data/catalog.json"  # Products, their search result links and add-to-bag flows
 
+    # Readiness waits (modules/readiness.py)
+    READINESS_LATENCY_FILE = "readiness_latencies.json"  # Recorded wait durations, reused to size timeouts
+    READINESS_DEFAULT_TIMEOUT_MS = 30000  # Timeout used until a wait has recorded history
+    READINESS_MIN_TIMEOUT_MS = 5000  # Adaptive timeouts never go below this
+    READINESS_TIMEOUT_FACTOR = 3  # Adaptive timeout = slowest recent wait * factor
+    READINESS_HISTORY_SIZE = 50  # Samples kept per named wait
+
+    # Critical requests per step (modules/request_tracker.py), fnmatch patterns on the request URL.
+    # A step continues once every pattern has a finished request on the current document.
+    CRITICAL_REQUESTS = {
+        "homepage": ["*/ac/globalnav/*"],  # The document itself has loaded once goto() returns
+        "search_ready": ["*/ac/globalnav/*"],
+        "search_results": ["*/search/*"],
+        "review_bag": ["*/shop/bag*"],  # With or without a query string
+        "bag_screenshot": ["*/shop/bag*"],
+        "homepage_return": ["*/ac/globalnav/*"],
+    }
+    CRITICAL_REQUEST_TIMEOUT_MS = 30000
+    CRITICAL_REQUEST_POLL_MS = 50
+    NETWORKIDLE_QUIET_MS = 500  # Quiet window Playwright uses for "networkidle"
+
+    # Warm BrowserContext pool (modules/context_pool.py, used by browser_setup in parallel mode and the `page` fixture in conftest.py)
+    VIEWPORT = {"width": 1920, "height": 1080}
+    CONTEXT_POOL_SIZE = 2  # Contexts created up front
+    CONTEXT_POOL_MAX_USES = 20  # A context is closed and replaced after this many tests
+
+    # Network record/replay (modules/network_archive.py), selected with NETWORK_MODE=live|record|replay
+    HAR_DIR = "har"
+    HAR_VERSION = "v1"  # Bump when the site changes enough that old archives should not be replayed
+    # First matching page URL pattern decides which flow archive a request belongs to
+    HAR_FLOWS = [
+        ("search", "*/search/*"),
+        ("bag", "*/shop/bag*"),
+        ("buy", "*/shop/buy-*"),
+        ("product", "https://www.apple.com/*/*"),
+        ("homepage", "*"),
+    ]
+
+    # Per-step resource blocking (modules/resource_policy.py), disabled with RESOURCE_BLOCKING=false
+    BLOCKED_DOMAINS = ["*.omtrdc.net", "*.demdex.net", "*.doubleclick.net", "*.google-analytics.com",
+                       "*.googletagmanager.com", "*.mpulse.net", "*.akstat.io"]
+    RESOURCE_POLICIES = {
+        "full": [],  # Steps that take screenshots need the page as a user sees it
+        "dom": ["image", "media", "font"],  # Steps that only click need the DOM
+    }
+    # Step function -> policy; steps not listed use "full". A step that loads a page which a later
+    # step screenshots (e.g. proceed_to_review_bag) must stay "full".
+    STEP_RESOURCE_POLICY = {
+        "remove_product_from_bag": "dom",
+        "return_to_homepage": "dom",
+        "close_browser": "dom",
+    }
+
+    # Screenshot pipeline (modules/screenshots.py)
+    SCREENSHOT_DIR = "screenshots"
+    SCREENSHOT_FORMAT = "png"  # "png" or "jpeg"; overridden by the SCREENSHOT_FORMAT environment variable
+    SCREENSHOT_QUALITY = 80  # JPEG only
+    SCREENSHOT_WORKERS = 2  # Background threads writing screenshots to disk
+
+    # Visual regression (modules/visual_diff.py), enabled with VISUAL_REGRESSION=true
+    BASELINE_DIR = "screenshots/baselines"
+    DIFF_DIR = "screenshots/diffs"
+    VISUAL_DIFF_TILE = 32  # Tile size in pixels; the diff mask has one bit per tile
+    VISUAL_DIFF_PIXEL_THRESHOLD = 16  # Per-channel difference below this is noise
+    VISUAL_DIFF_MAX_CHANGED_TILES = 0.01  # Fraction of changed tiles that still passes
+    VISUAL_DIFF_MAX_HASH_DISTANCE = 6  # Average-hash bits (of 64) that may differ; more means the layout moved
+    # Dynamic regions ignored per screenshot name without extension (png or jpeg), as (x, y, width, height)
+    VISUAL_DIFF_MASKS = {
+        "reviewed_iPhone_16_Pro": [(0, 0, 1920, 120)],  # Global nav and promo ribbon
+        "reviewed_MacBook_Pro": [(0, 0, 1920, 120)],
+    }
+
+    # Logging (modules/run_log.py)
+    LOG_FILE = "test_results.txt"  # Human-readable log of the controller process
+    LOG_DIR = "logs"  # Per-worker JSONL step events, merged into logs/run.jsonl at session end
+
+    # Step instrumentation (modules/instrumentation.py), disabled with INSTRUMENTATION=false
+    INSTRUMENTATION_FILE = "logs/instrumentation_{worker}.json"
+
+    # Local stand-in storefront (modules/storefront.py) used by benchmarks and load runs
+    STOREFRONT_DIR = "storefront"
+    STOREFRONT_LATENCY_MS = 0  # Artificial server latency added to every response
+
+    # Step benchmarks (benchmarks/test_step_benchmarks.py)
+    BENCHMARK_BASELINE_FILE = "benchmarks/baseline.json"
+    BENCHMARK_ITERATIONS = 50
+    BENCHMARK_REGRESSION_THRESHOLD = 0.25  # Fail when a step's median is this much slower than its baseline
+    BENCHMARK_MIN_REGRESSION_S = 0.02  # ...and at least this much slower, so millisecond steps do not flap
+
+    # Locator resolution cache (modules/locator_cache.py), disabled with LOCATOR_CACHE=false
+    LOCATOR_CACHE_FILE = "locator_cache.json"
+    LOCATOR_CACHE_PROBE_MS = 2000  # How long a cached selector may take to appear before falling back
+
+    # Warm start (modules/warm_start.py), enabled with WARM_START=true
+    WARM_START_DIR = "warm_start"  # Storage state snapshot and cached static assets, shared by all workers
+    WARM_START_MAX_AGE_S = 6 * 60 * 60  # Snapshots older than this are rebuilt
+    WARM_START_RESOURCE_TYPES = ["script", "stylesheet", "font", "image"]
+
+    # Asyncio runner (modules/async_runner.py)
+    ASYNC_CONCURRENCY = 8  # Product flows running at once on the event loop
+
+    # Persistent browser daemon (modules/browser_server.py)
+    BROWSER_SERVER_STATE_FILE = "browser_server.json"
+    BROWSER_SERVER_PORT = 9333  # Chromium remote debugging port fixtures connect to
+    BROWSER_SERVER_MAX_AGE_S = 4 * 60 * 60  # The daemon relaunches Chromium once idle and older than this
+    BROWSER_SERVER_CHECK_S = 5  # Interval of the daemon's health checks
+
+    # Recorded test durations (modules/durations.py), used to schedule the slowest tests first
+    DURATIONS_FILE = "durations.json"
+    DEFAULT_TEST_SECONDS = 60  # Estimate for a test without history (not a pytest-bdd scenario)
+    DEFAULT_STEP_SECONDS = 10  # Estimate per step for a pytest-bdd scenario without history
+    ENGINE_DURATION_FACTOR = {"chromium": 1.0, "firefox": 1.3, "webkit": 1.6}  # Used until an engine has history
+
+    # Step checkpoints (modules/checkpoints.py), enabled with CHECKPOINTS=true
+    CHECKPOINT_DIR = "checkpoints"
+
+    # Batch cart mode (modules/bag_batch.py, features/parameter_batch.feature), BAG_MODE=batch.
+    # fnmatch patterns of the bag calls whose responses confirm an item was added or removed.
+    BAG_ADD_PATTERNS = ["*/shop/bag/add*"]
+    BAG_REMOVE_PATTERNS = ["*/shop/bag/remove*"]
+    BAG_RESPONSE_TIMEOUT_MS = 30000
+
+    # Tracing ring buffer (modules/trace_buffer.py), disabled with TRACING=false
+    TRACE_DIR = "traces"
+    TRACE_BUFFER_STEPS = 5  # Trace chunks of the last steps kept in memory per context
+
+    # Streaming HTML report (modules/stream_report.py), written with --stream-report DIR
+    STREAM_REPORT_PAGE_SIZE = 200  # Results per report page
+    THUMBNAIL_DIR = "thumbs"  # Subdirectory of a screenshot's directory holding its thumbnail
+    THUMBNAIL_WIDTH = 240
+
+    # Load and soak runs (modules/load_generator.py) against the stand-in storefront
+    LOAD_STAGES = [1, 2, 4, 8]  # Concurrent virtual users of each ramp stage
+    LOAD_STAGE_SECONDS = 60
+    LOAD_INTERVAL_S = 10  # Width of the throughput-over-time buckets
+    LOAD_HISTOGRAM_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+    LOAD_SATURATION_GAIN = 0.1  # A stage adding less throughput than this fraction is past saturation
+    LOAD_REPORT_FILE = "logs/load_report.json"
+    LOAD_MAX_ERROR_RATE = 0.05  # A stage with more failed journeys than this fails the run
+
+    # Compiled feature cache (modules/feature_cache.py)
+    FEATURE_CACHE_DIR = ".feature_cache"
+    FEATURE_LAZY_MIN_ROWS = 20  # Examples tables this large (e.g. from PRODUCT_DATASET) are split by --shard before expansion
+
+    # External product dataset streamed into the Examples rows (modules/product_dataset.py), PRODUCT_DATASET=<csv|jsonl>
+    DATASET_PER_FAMILY = 1  # Rows taken per product family each run
+    DATASET_SEED = "apple-search"  # Seed of the sampling order when cursors are off (DATASET_CURSOR=false)
+    DATASET_CURSOR_FILE = "dataset_cursor.json"  # Per-family position, advanced after every run; env DATASET_CURSOR_FILE
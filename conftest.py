@@ -1,19 +1,210 @@
+import os
+import time
+
 import pytest
 from playwright.sync_api import sync_playwright
 
+from modules import checkpoints, durations, feature_cache, instrumentation, locator_cache, network_archive
+from modules import product_dataset, resource_policy, run_log, screenshots, trace_buffer
+from modules.browser_server import connect_or_launch
+from modules.context_pool import ContextPool
+from modules.shard_planner import parse_shard, plan, summary
+from modules.stream_report import StreamReport
+
+_stream_report = None
+
 # Fixture to set up Playwright and browser context
 @pytest.fixture(scope="session")
 def browser():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)  # Set headless=True for headless mode
+        browser = connect_or_launch(p.chromium, headless=False)  # Set headless=True for headless mode
         yield browser
         browser.close()
 
+# Pre-warmed contexts, reset and reused between tests instead of created and closed per test
+@pytest.fixture(scope="session")
+def context_pool(browser):
+    pool = ContextPool(browser)
+    yield pool
+    pool.close()
+
 @pytest.fixture(scope="function")
-def page(browser):
-    context = browser.new_context()
-    page = context.new_page()
+def page(context_pool, request):
+    context = context_pool.acquire()
+    page = context.pages[0]
     yield page
-    context.close()
+    # Contexts used by a failed test are evicted rather than reused
+    report = getattr(request.node, "rep_call", None)
+    context_pool.release(context, failed=report is None or report.failed)
+
+# Store each phase's report on the test item so fixtures can see whether the test failed
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+    # Travels with the report to the xdist controller, which records durations per engine
+    engine = durations.engine_of(item)
+    if engine and report.when == "call":
+        report.user_properties.append(("browser_name", engine))
+    # Screenshots of the test, linked from the streaming report
+    if report.when == "call":
+        report.user_properties.append(("screenshots", screenshots.taken()))
+    # Per-scenario step timeline in the pytest-html report
+    scenario = getattr(item, "scenario_timeline", None)
+    pytest_html = item.config.pluginmanager.getplugin("html")
+    if report.when == "call" and scenario and pytest_html is not None:
+        extras = getattr(report, "extras", [])
+        extras.append(pytest_html.extras.html(instrumentation.timeline_html(scenario)))
+        report.extras = extras
+
+# Record how long each test took and stream its result; only the controller sees every worker's reports
+def pytest_runtest_logreport(report):
+    if not run_log.is_worker():
+        durations.record(report.nodeid, report.duration, dict(report.user_properties).get("browser_name"))
+    if _stream_report is not None:
+        _stream_report.add(report, dict(report.user_properties).get("screenshots", []))
+
+def pytest_addoption(parser):
+    parser.addoption("--shard", default=None, metavar="i/n",
+                     help="run only shard i of n, balanced by recorded test durations")
+    parser.addoption("--stream-report", default=None, metavar="DIR",
+                     help="append results to a paginated HTML report in DIR as tests finish")
+
+# Keep only this job's shard, then in parallel mode start the slowest tests (e.g. WebKit) first;
+# sequential mode must keep the feature order
+def pytest_collection_modifyitems(config, items):
+    shard = config.getoption("--shard")
+    if shard:
+        try:
+            index, count = parse_shard(shard)
+        except ValueError as e:
+            raise pytest.UsageError(str(e))
+        # Rows of large Examples tables were already cut to this shard before expansion
+        prefiltered = [item for item in items if feature_cache.prefiltered(item)]
+        shards = plan([item for item in items if not feature_cache.prefiltered(item)], count)
+        reporter = config.pluginmanager.get_plugin("terminalreporter")
+        shard_summary = summary(shards, index, prefiltered, feature_cache.shard_rows())
+        for number, (tests, seconds) in enumerate(shard_summary, start=1):
+            if reporter and not run_log.is_worker():
+                reporter.write_line(f"Shard {number}/{count}: {tests} tests, expected {seconds:.0f}s")
+        selected = prefiltered + shards[index - 1][1]
+        selected_ids = {item.nodeid for item in selected}
+        config.hook.pytest_deselected(items=[item for item in items if item.nodeid not in selected_ids])
+        items[:] = selected
+    if os.getenv('PARALLEL', 'false').lower() == 'true':
+        durations.longest_first(items)
+
+def pytest_collection_finish(session):
+    feature_cache.report()
+
+# Queue-based logging for the whole run; every xdist worker writes its own JSONL file.
+# With --stream-report, screenshots get thumbnails and the controller opens the report.
+def pytest_configure(config):
+    global _stream_report
+    if not run_log.is_worker():
+        run_log.clear_worker_logs()
+        checkpoints.clear_checkpoints()
+    run_log.setup_logging()
+    # The recorder writes each flow's archive whole, so workers would overwrite each other's
+    if network_archive.network_mode() == "record" and config.getoption("numprocesses", None):
+        raise pytest.UsageError("NETWORK_MODE=record cannot run under pytest-xdist; record without -n.")
+    # Parallel-mode rows are independent, so large Examples tables can be split by shard before expansion
+    shard = config.getoption("--shard")
+    if shard and os.getenv('PARALLEL', 'false').lower() == 'true':
+        try:
+            feature_cache.set_shard(*parse_shard(shard))
+        except ValueError:
+            pass  # Reported as a usage error during collection
+    if config.getoption("--stream-report"):
+        screenshots.enable_thumbnails()
+        if not run_log.is_worker():
+            _stream_report = StreamReport(config.getoption("--stream-report"))
+
+# Stop the log listener and, in the controller, merge the worker files into logs/run.jsonl
+def pytest_unconfigure(config):
+    run_log.stop_logging()
+    if not run_log.is_worker():
+        run_log.merge_worker_logs()
+
+_step_started = {}
+
+# The page of the scenario. before_step runs before the step's own fixtures are resolved, so on the
+# first step browser_setup is not requested yet; resolve it here (it is the same instance the step gets)
+def _step_page(request):
+    try:
+        return request.getfixturevalue("browser_setup")
+    except pytest.FixtureLookupError:
+        pass
+    if "page" in request.fixturenames:
+        return request.getfixturevalue("page")
+    return None
+
+# Switch the resource blocking policy to the one of the step about to run and start its trace chunk;
+# on a resumed retry, restore the last checkpoint before the first step that did not complete
+@pytest.hookimpl(optionalhook=True)
+def pytest_bdd_before_step(request, feature, scenario, step, step_func):
+    resource_policy.set_step(step_func.__name__)
+    trace_buffer.start_step(_step_page(request))
+    checkpoints.before_step(_step_page(request))
+    instrumentation.start_step(step.name)
+    _step_started[id(step)] = time.perf_counter()
+
+def _log_step_event(scenario, step, step_func_args, status):
+    page = step_func_args.get("browser_setup") or step_func_args.get("page")
+    started = _step_started.pop(id(step), time.perf_counter())
+    run_log.log_step(step.name, time.perf_counter() - started,
+                     scenario=scenario.name, product=step_func_args.get("product"),
+                     url=page.url if page is not None else None, status=status)
+
+# Write a structured event for every step, buffer its trace chunk and checkpoint the scenario after it
+@pytest.hookimpl(optionalhook=True)
+def pytest_bdd_after_step(request, feature, scenario, step, step_func, step_func_args):
+    instrumentation.finish_step("passed")
+    _log_step_event(scenario, step, step_func_args, "passed")
+    trace_buffer.finish_step(_step_page(request), step.name)
+    checkpoints.after_step(request.node.nodeid, step.name, _step_page(request))
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_bdd_step_error(request, feature, scenario, step, step_func, step_func_args, exception):
+    instrumentation.finish_step("failed")
+    _log_step_event(scenario, step, step_func_args, "failed")
+    checkpoints.step_failed()
+    trace_buffer.finish_step(_step_page(request), step.name, failed=True, scenario_name=scenario.name)
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_bdd_before_scenario(request, feature, scenario):
+    instrumentation.start_scenario(scenario.name)
+    checkpoints.start_scenario(request.node)
+
+# Report requests and bytes avoided by resource blocking for each scenario and keep its step timeline
+@pytest.hookimpl(optionalhook=True)
+def pytest_bdd_after_scenario(request, feature, scenario):
+    resource_policy.report_scenario(scenario.name)
+    request.node.scenario_timeline = instrumentation.finish_scenario()
+    checkpoints.finish_scenario(request.node.nodeid)
+
+# Wait for screenshots still being written in the background, report the run's overheads, then compare
+# the screenshots with the baselines
+def pytest_sessionfinish(session, exitstatus):
+    # A shard can be empty when there are fewer indivisible units than shards; that is not a failure
+    if session.config.getoption("--shard") and exitstatus == pytest.ExitCode.NO_TESTS_COLLECTED:
+        session.exitstatus = pytest.ExitCode.OK
+    screenshots.flush()
+    if _stream_report is not None:
+        _stream_report.close()
+    instrumentation.export()
+    locator_cache.report()
+    trace_buffer.report()
+    if not run_log.is_worker():
+        durations.save()
+        # The next run continues after this run's dataset rows, unless the run was interrupted
+        if exitstatus in (pytest.ExitCode.OK, pytest.ExitCode.TESTS_FAILED):
+            product_dataset.save_cursor()
+        # Once, in the controller, after every worker has written its screenshots
+        if os.getenv('VISUAL_REGRESSION', 'false').lower() == 'true':
+            from modules.visual_diff import compare_all
+            if compare_all():
+                session.exitstatus = pytest.ExitCode.TESTS_FAILED
 
 # Optional: You can add more fixtures or configuration here if needed
@@ -0,0 +1,19 @@
+Feature: Apple Search and Cart (batch)
+
+  # Batch cart mode: every product of a row is added in one session, the bag is checked from the
+  # responses of the bag add calls and emptied in one pass.
+  # BAG_MODE=batch pytest tests/test_parameter_apple_search_module.py
+
+  Scenario Outline: Add several products to the bag at once
+    Given I am on the Apple homepage
+    When I add "<products>" to the bag in one session
+    Then the bag responses should confirm "<products>"
+    Then I should be able to proceed to the review bag
+    And a screenshot of the reviewed "bag" should be taken
+    Then every product should be removed from the bag in one pass
+    Then I return to the Apple homepage
+
+  Examples:
+    | products                                |
+    | iPhone 16 Pro, MacBook Pro              |
+    | MacBook Pro, iPhone 16 Pro, MacBook Pro |
@@ -0,0 +1,19 @@
+Feature: Apple Search and Cart (parallel)
+
+  # Every Examples row is self-contained: it opens the homepage in its own browser context
+  # and leaves the bag empty, so rows can run in any order across pytest-xdist workers.
+  # PARALLEL=true pytest -n auto tests/test_parameter_apple_search_module.py
+
+  Scenario Outline: Search for a product in an isolated context
+    Given I am on the Apple homepage
+    When I search for "<product>"
+    When I add the first "<product>" result to the bag
+    Then I should be able to proceed to the review bag
+    And a screenshot of the reviewed "<product>" should be taken
+    Then the "<product>" should be removed or deleted from the bag
+    Then I return to the Apple homepage
+
+  Examples:
+    | product         |
+    | iPhone 16 Pro   |
+    | MacBook Pro     |
@@ -12,20 +12,13 @@ import pytest
 import time
 from playwright.sync_api import Page, Playwright
 from pytest_bdd import scenarios, given, then, when
-from config.config import Config  # Import Config class
-
-# Set up logging
-log_file = 'test_results.txt'
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(message)s",
-    handlers=[
-        logging.FileHandler(log_file, mode='w'),
-        logging.StreamHandler()
-    ]
-)
+from modules.catalog import load_catalog  # Products, search result links and add-to-bag flows
+from modules import feature_cache
+
+# Logging goes through the queue-based backend set up in conftest.py (modules/run_log.py)
 logger = logging.getLogger()
 
+feature_cache.prepare(__file__, '../features/apple_search.feature')  # Parsed once per content hash
 scenarios('../features/apple_search.feature')
 
 # Ensure the screenshots directory exists
@@ -53,10 +46,10 @@ def product_to_search():
     while attempts_remaining > 0:
         user_input = input(
             "Enter the product name you want to search (e.g., 'MacBook Pro' or 'iPhone 16 Pro Max'): ").strip()
-        matching_products = [product for product in Config.PRODUCT_NAME if user_input.lower() in product.lower()]
+        matching_product = load_catalog().find(user_input)
 
-        if matching_products:
-            return matching_products[0]
+        if matching_product:
+            return matching_product.name
         else:
             attempts_remaining -= 1  # Decrease attempts remaining
             print(f"Product '{user_input}' not found in the config. Please try again.")
@@ -98,14 +91,7 @@ def search_for_product(browser_setup: Page, product_to_search):
     # page.wait_for_timeout(5000)
 
     # Navigate to the product page
-    if "MacBook Pro" in product:
-        product_name = "MacBook Pro - Apple"
-        # page.get_by_role("link", name="MacBook Pro - Apple", exact=True).click()
-    elif "iPhone" in product:
-        product_name = "iPhone 16 Pro and iPhone 16 Pro Max - Apple"
-        # page.get_by_role("link", name="iPhone 16 Pro and iPhone 16 Pro Max - Apple", exact=True).click()
-    else:
-        raise ValueError(f"Product '{product}' is not handled in the script.")
+    product_name = load_catalog().get(product).search_link
 
     page.get_by_role("link", name=product_name, exact=True).click()
     page.wait_for_timeout(5000)
@@ -117,37 +103,7 @@ def add_product_to_bag(browser_setup: Page, product_to_search):
     page = browser_setup
     product = product_to_search
 
-    if "MacBook Pro" in product:
-        page.locator("section").filter(has_text="MacBook Pro Mind-blowing.Head").get_by_label(
-            "Buy, MacBook Pro").click()
-        page.get_by_role("radio", name="16-inch").click()
-        page.get_by_role("tab", name="M3 Pro").click()
-        page.get_by_role("button", name="Select Apple M3 Pro with 12-").nth(1).click()
-        page.get_by_role("button", name="Add to Bag").click()
-        page.wait_for_timeout(5000)
-        page.screenshot(path='screenshots/MacBook Pro.png')
-        logger.info("Screenshot of the MacBook Pro taken.")
-
-    elif "iPhone 16 Pro Max" in product:
-        page.wait_for_timeout(5000)
-        # page.locator("section").filter(has_text="iPhone 16 Pro Hello, Apple").get_by_label("Buy iPhone 16 Pro").click()
-
-        page.locator("section:has-text('iPhone 16 Pro Hello, Apple')").locator('a[aria-label="Buy iPhone 16 Pro"]').nth(
-            0).click()
-        page.locator("label").filter(has_text="iPhone 16 Pro 6.3-inch").click()
-        page.locator("label").filter(has_text="Desert Titanium").locator("img").click()
-        page.locator("label").filter(has_text="256GB Footnote ² From $1099").click()
-        page.locator("#noTradeIn_label").click()
-        page.get_by_text("Buy$1,099.00Pay with Apple").click()
-        page.get_by_text("Connect to any carrier later$").click()
-        page.locator("#applecareplus_58_noapplecare_label").click()
-        page.get_by_role("button", name="Add to Bag").click()
-        page.wait_for_timeout(5000)
-        page.screenshot(path='screenshots/iPhone 16 Pro Max.png')
-        logger.info("Screenshot of the iPhone 16 Pro Max taken.")
-
-    else:
-        raise ValueError(f"Product '{product}' not handled by the script.")
+    load_catalog().get(product).add_to_bag(page)  # Run the product's add-to-bag flow from the catalog
 
 
 @then("I should be able to proceed to the review bag")
@@ -15,22 +15,13 @@ import sys
 import pytest
 from playwright.sync_api import Page, Playwright
 from pytest_bdd import scenarios, given, then, when
-from config.config import Config
-from modules.macbook_actions import handle_macbook  # Import MacBook actions
-from modules.iphone_actions import handle_iphone  # Import iPhone actions
-
-# Set up logging
-log_file = 'test_results.txt'
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(message)s",
-    handlers=[
-        logging.FileHandler(log_file, mode='w'),
-        logging.StreamHandler()
-    ]
-)
+from modules.catalog import load_catalog  # Products, search result links and add-to-bag flows
+from modules import feature_cache
+
+# Logging goes through the queue-based backend set up in conftest.py (modules/run_log.py)
 logger = logging.getLogger()
 
+feature_cache.prepare(__file__, '../features/apple_search.feature')  # Parsed once per content hash
 scenarios('../features/apple_search.feature')
 
 # Ensure the screenshots directory exists
@@ -59,10 +50,10 @@ def product_to_search():
     while attempts_remaining > 0:
         user_input = input(
             "Enter the product name you want to search (e.g., 'MacBook Pro' or 'iPhone 16 Pro Max'): ").strip()
-        matching_products = [product for product in Config.PRODUCT_NAME if user_input.lower() in product.lower()]
+        matching_product = load_catalog().find(user_input)
 
-        if matching_products:
-            return matching_products[0]
+        if matching_product:
+            return matching_product.name
         else:
             attempts_remaining -= 1  # Decrease attempts remaining
             print(f"Product '{user_input}' not found in the config. Please try again.")
@@ -98,12 +89,7 @@ def search_for_product(browser_setup: Page, product_to_search):
     page.wait_for_load_state("networkidle")
     page.screenshot(path=f'screenshots/search_results_for_{product}.png')
 
-    if "MacBook Pro" in product:
-        product_name = "MacBook Pro - Apple"
-    elif "iPhone" in product:
-        product_name = "iPhone 16 Pro and iPhone 16 Pro Max - Apple"
-    else:
-        raise ValueError(f"Product '{product}' is not handled in the script.")
+    product_name = load_catalog().get(product).search_link
 
     page.get_by_role("link", name=product_name, exact=True).click()
     page.wait_for_timeout(5000)
@@ -114,12 +100,7 @@ def add_product_to_bag(browser_setup: Page, product_to_search):
     page = browser_setup
     product = product_to_search
 
-    if "MacBook Pro" in product:
-        handle_macbook(page)  # Call the function for MacBook
-    elif "iPhone 16 Pro Max" in product:
-        handle_iphone(page)  # Call the function for iPhone
-    else:
-        raise ValueError(f"Product '{product}' not handled by the script.")
+    load_catalog().get(product).add_to_bag(page)  # Run the product's add-to-bag flow from the catalog
 
 
 @then("I should be able to proceed to the review bag")
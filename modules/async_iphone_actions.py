@@ -0,0 +1,31 @@
+# async_iphone_actions.py
+# playwright.async_api version of iphone_actions.py, used by the asyncio runner (async_runner.py)
+# to drive many product flows from one process.
+
+import logging
+
+from modules.readiness import async_wait_for_actionable
+from modules.screenshots import async_capture
+
+logger = logging.getLogger()
+
+
+async def async_handle_iphone(page):
+    """
+    Handle actions related to iPhone 16 Pro Max on an async page.
+    """
+    logger.info("Handling iPhone 16 Pro Max actions.")
+    buy_link = page.locator("section:has-text('iPhone 16 Pro Hello, Apple')").locator('a[aria-label="Buy iPhone 16 Pro"]').nth(0)
+    await async_wait_for_actionable(buy_link, "iphone_buy_link", fixed_budget_ms=10000)
+    await buy_link.click(timeout=60000)
+    await page.locator("label").filter(has_text="iPhone 16 Pro 6.3-inch").click()
+    await page.locator("label").filter(has_text="Desert Titanium").locator("img").click()
+    await page.locator("label").filter(has_text="256GB Footnote ² From $1099").click()
+    await page.locator("#noTradeIn_label").click()
+    await page.get_by_text("Buy$1,099.00Pay with Apple").click()
+    await page.get_by_text("Connect to any carrier later$").click()
+    await page.locator("#applecareplus_58_noapplecare_label").click()
+    await page.get_by_role("button", name="Add to Bag").click()
+    await async_wait_for_actionable(page.get_by_role("button", name="Review Bag"), "iphone_added_to_bag", fixed_budget_ms=5000)
+    await async_capture(page, 'iPhone 16 Pro Max.png')
+    logger.info("Screenshot of iPhone 16 Pro Max taken.")
@@ -0,0 +1,25 @@
+# async_macbook_actions.py
+# playwright.async_api version of macbook_actions.py, used by the asyncio runner (async_runner.py)
+# to drive many product flows from one process.
+
+import logging
+
+from modules.readiness import async_wait_for_actionable
+from modules.screenshots import async_capture
+
+logger = logging.getLogger()
+
+
+async def async_handle_macbook(page):
+    """
+    Handle actions related to MacBook Pro on an async page.
+    """
+    logger.info("Handling MacBook Pro actions.")
+    await page.locator("section").filter(has_text="MacBook Pro Mind-blowing.Head").get_by_label("Buy, MacBook Pro").click()
+    await page.get_by_role("radio", name="16-inch").click()
+    await page.get_by_role("tab", name="M3 Pro").click()
+    await page.get_by_role("button", name="Select Apple M3 Pro with 12-").nth(1).click()
+    await page.get_by_role("button", name="Add to Bag").click()
+    await async_wait_for_actionable(page.get_by_role("button", name="Review Bag"), "macbook_added_to_bag", fixed_budget_ms=5000)
+    await async_capture(page, 'MacBook_Pro.png')
+    logger.info("Screenshot of MacBook Pro taken.")
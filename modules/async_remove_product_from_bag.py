@@ -0,0 +1,9 @@
+from playwright.async_api import Page
+
+
+async def async_handle_remove_product(page: Page, product_name: str):
+    # bag or cart item that matches the product name with variable "{product_name}"
+    remove_button = page.locator(f'[data-autom="bag-item-remove-button"]:has-text("{product_name}")')
+
+    await remove_button.wait_for(state="visible", timeout=5000)
+    await remove_button.click()
@@ -0,0 +1,108 @@
+# async_runner.py
+# Runs many product flows at once from one process on a single asyncio event loop, each in its own
+# browser context, with at most Config.ASYNC_CONCURRENCY flows in flight. Uses the async versions of
+# the product modules (async_iphone_actions.py, async_macbook_actions.py, async_remove_product_from_bag.py).
+#
+# python -m modules.async_runner "iPhone 16 Pro" "MacBook Pro" --repeat 10 --concurrency 8
+# python -m modules.async_runner "MacBook Pro" --url http://127.0.0.1:8000/   -> against the stand-in storefront
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+from playwright.async_api import async_playwright
+
+from config.config import Config
+from modules.async_remove_product_from_bag import async_handle_remove_product
+from modules.catalog import load_catalog
+from modules.readiness import async_wait_for_bag_count, async_wait_for_url, async_wait_for_url_change
+
+logger = logging.getLogger()
+
+BAG_ITEM_SELECTOR = '[data-autom="bag-item-remove-button"]'
+
+
+async def run_flow(page, product_name):
+    """
+    The flow of parameter.feature for one product: search, add to bag, review, remove, return home.
+    """
+    product = load_catalog().get(product_name)
+    await page.goto(Config.HOMEPAGE_URL, wait_until="domcontentloaded")
+
+    await page.get_by_role("button", name="Search apple.com").click()
+    search_input = page.get_by_placeholder("Search apple.com")
+    await search_input.fill(product_name)
+    await search_input.press("Enter")
+    await page.wait_for_selector('text="Search Results"', timeout=10000)
+
+    search_url = page.url
+    await page.get_by_role("link", name=product.search_link, exact=True).click()
+    await async_wait_for_url_change(page, "product_page_opened", search_url, fixed_budget_ms=5000)
+
+    if product.async_add_to_bag is None:
+        raise ValueError(f"Product '{product_name}' has no async add-to-bag flow in {Config.CATALOG_FILE}.")
+    await product.async_add_to_bag(page)
+
+    review_bag_button = page.get_by_role("button", name="Review Bag")
+    await review_bag_button.wait_for(state="visible", timeout=5000)
+    await review_bag_button.click()
+    await page.wait_for_url("**/shop/bag**")
+
+    items_before = await page.locator(BAG_ITEM_SELECTOR).count()
+    await async_handle_remove_product(page, product_name)
+    await async_wait_for_bag_count(page, "bag_item_removed", BAG_ITEM_SELECTOR, max(items_before - 1, 0),
+                                   fixed_budget_ms=2000)
+
+    await page.locator("a.globalnav-link-apple").click()
+    await async_wait_for_url(page, "homepage_returned", Config.HOMEPAGE_URL, fixed_budget_ms=2000)
+
+
+async def _run_one(browser, semaphore, product_name, results):
+    async with semaphore:
+        context = await browser.new_context(viewport=Config.VIEWPORT)
+        start = time.perf_counter()
+        try:
+            await run_flow(await context.new_page(), product_name)
+            results.append((product_name, "passed", time.perf_counter() - start))
+        except Exception as e:
+            logger.error(f"Flow for {product_name} failed: {e}")
+            results.append((product_name, "failed", time.perf_counter() - start))
+        finally:
+            await context.close()
+
+
+async def run_flows(product_names, concurrency=None, headless=True):
+    """
+    Run a flow per entry of `product_names` (repeat a name to run it more than once).
+    Returns a list of (product, status, seconds).
+    """
+    semaphore = asyncio.Semaphore(concurrency or Config.ASYNC_CONCURRENCY)
+    results = []
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        start = time.perf_counter()
+        await asyncio.gather(*(_run_one(browser, semaphore, name, results) for name in product_names))
+        elapsed = time.perf_counter() - start
+        await browser.close()
+    passed = sum(1 for _, status, _ in results if status == "passed")
+    logger.info(f"{passed}/{len(results)} flows passed in {elapsed:.1f}s "
+                f"({len(results) / elapsed * 60:.1f} flows per minute).")
+    return results
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+    parser = argparse.ArgumentParser(description="Run product flows concurrently on one event loop.")
+    parser.add_argument("products", nargs="+", help="product names from the catalog")
+    parser.add_argument("--repeat", type=int, default=1, help="flows per product")
+    parser.add_argument("--concurrency", type=int, default=Config.ASYNC_CONCURRENCY)
+    parser.add_argument("--url", help="homepage to use instead of Config.HOMEPAGE_URL")
+    args = parser.parse_args()
+    if args.url:
+        Config.HOMEPAGE_URL = args.url
+    headless = os.getenv('HEADLESS', 'true').lower() == 'true'
+    flows = asyncio.run(run_flows(args.products * args.repeat, args.concurrency, headless))
+    sys.exit(0 if all(status == "passed" for _, status, _ in flows) else 1)
@@ -0,0 +1,127 @@
+# bag_batch.py
+# Batch cart mode: add several products in one session, check the bag from the responses of the
+# bag add/remove calls instead of polling the bag page's DOM, then remove every item in one pass.
+# The per-product cycle (add, open the bag, remove, return home) runs once per product; a batch
+# opens the bag once, so the cost per product drops as the list grows.
+
+import fnmatch
+import logging
+import time
+from collections import Counter
+
+from config.config import Config
+from modules.catalog import normalize
+
+logger = logging.getLogger()
+
+BAG_ITEM_SELECTOR = '[data-autom="bag-item-remove-button"]'
+
+
+class BagWatcher:
+    """
+    Records the bag add/remove calls of a page whose responses succeeded (Config.BAG_ADD_PATTERNS,
+    Config.BAG_REMOVE_PATTERNS). The item is the request body, or the "item" of a JSON response.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.added = []
+        self.removed = []
+        self.batch_start = 0
+        self.started = time.perf_counter()
+        page.on("response", self._on_response)
+
+    def detach(self):
+        """
+        Stop recording; the page outlives the watcher when its context is reused.
+        """
+        self.page.remove_listener("response", self._on_response)
+
+    def _on_response(self, response):
+        url = response.url
+        if any(fnmatch.fnmatch(url, pattern) for pattern in Config.BAG_ADD_PATTERNS):
+            events = self.added
+        elif any(fnmatch.fnmatch(url, pattern) for pattern in Config.BAG_REMOVE_PATTERNS):
+            events = self.removed
+        else:
+            return
+        if not response.ok:
+            logger.warning(f"Bag call {url} failed with status {response.status}.")
+            return
+        events.append(self._item(response))
+
+    @staticmethod
+    def _item(response):
+        try:
+            item = response.json().get("item")
+        except Exception:
+            item = None
+        return item or response.request.post_data
+
+    def contents(self):
+        """
+        Items added and not removed since the watcher was attached.
+        """
+        return Counter(self.added) - Counter(self.removed)
+
+    def wait_for(self, events, count, timeout=None):
+        timeout = timeout or Config.BAG_RESPONSE_TIMEOUT_MS
+        deadline = time.perf_counter() + timeout / 1000
+        while len(events) < count:
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"Only {len(events)} of {count} bag responses arrived in {timeout}ms.")
+            # Short waits keep Playwright dispatching response events to the listener
+            self.page.wait_for_timeout(Config.CRITICAL_REQUEST_POLL_MS)
+
+    def start_batch(self):
+        """
+        Mark the start of a batch; verify() only counts the adds after it. The watcher can outlive a
+        batch (it is session-scoped in sequential mode).
+        """
+        self.batch_start = len(self.added)
+        self.started = time.perf_counter()
+
+    def verify(self, product_names):
+        """
+        Wait for an add response per product of the batch and check how many of each product were added.
+        """
+        self.wait_for(self.added, self.batch_start + len(product_names))
+        added = Counter(normalize(item or "") for item in self.added[self.batch_start:])
+        expected = Counter(normalize(name) for name in product_names)
+        missing = expected - added
+        if missing:
+            raise AssertionError(f"The bag responses do not confirm {dict(missing)}; added: {dict(added)}.")
+        logger.info(f"Bag responses confirm {len(product_names)} products: {dict(added)}.")
+
+    def checkpoint_state(self):
+        """
+        The recorded bag responses, saved with step checkpoints (modules/checkpoints.py).
+        """
+        return {"added": self.added, "removed": self.removed, "batch_start": self.batch_start}
+
+    def restore_checkpoint(self, state):
+        """
+        Continue a resumed scenario from the bag responses recorded before its checkpoint.
+        """
+        self.added = list(state["added"])
+        self.removed = list(state["removed"])
+        self.batch_start = state["batch_start"]
+        self.started = time.perf_counter()
+
+    def remove_all(self):
+        """
+        Click every remove button of the bag page, then wait for all the remove responses.
+        Element handles stay bound to their item while the list shrinks, unlike nth() locators.
+        """
+        buttons = self.page.query_selector_all(BAG_ITEM_SELECTOR)
+        removed_before = len(self.removed)
+        for button in buttons:
+            button.click()
+        self.wait_for(self.removed, removed_before + len(buttons))
+        logger.info(f"Removed {len(buttons)} items from the bag in one pass.")
+        return len(buttons)
+
+    def report(self, product_count):
+        elapsed = time.perf_counter() - self.started
+        logger.info(f"Batch of {product_count} products took {elapsed:.1f}s "
+                    f"({elapsed / max(product_count, 1):.1f}s per product).")
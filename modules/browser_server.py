@@ -0,0 +1,137 @@
+# browser_server.py
+# Long-lived Chromium reused across pytest invocations. The daemon keeps a browser running with a
+# remote debugging endpoint; fixtures connect to it with connect_over_cdp() when it is healthy and
+# fall back to launching a browser themselves. The daemon checks the browser's health and relaunches
+# it when it died, or when it is idle and older than Config.BROWSER_SERVER_MAX_AGE_S.
+#
+# python -m modules.browser_server start     -> run the daemon (HEADLESS=true for a headless browser)
+# python -m modules.browser_server status
+# python -m modules.browser_server stop
+
+import argparse
+import json
+import logging
+import os
+import signal
+import sys
+import time
+import urllib.request
+
+from playwright.sync_api import sync_playwright
+
+from config.config import Config
+
+logger = logging.getLogger()
+
+
+def _endpoint(port):
+    return f"http://127.0.0.1:{port}"
+
+
+def read_state():
+    try:
+        with open(Config.BROWSER_SERVER_STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_state(state):
+    tmp_file = f"{Config.BROWSER_SERVER_STATE_FILE}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_file, Config.BROWSER_SERVER_STATE_FILE)
+
+
+def _get_json(url):
+    with urllib.request.urlopen(url, timeout=1) as response:
+        return json.load(response)
+
+
+def is_healthy(endpoint):
+    try:
+        _get_json(f"{endpoint}/json/version")
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def is_idle(endpoint):
+    """
+    True when no client has a page open in the browser.
+    """
+    try:
+        return not any(target["type"] == "page" and target["url"] != "about:blank"
+                       for target in _get_json(f"{endpoint}/json/list"))
+    except (OSError, ValueError):
+        return False
+
+
+def connect_or_launch(browser_type, headless):
+    """
+    Connect to the daemon's browser when it is healthy and runs in the same headless mode,
+    otherwise launch a browser. The daemon only runs Chromium.
+    Closing the returned browser only disconnects from the daemon.
+    """
+    state = read_state()
+    if (browser_type.name == "chromium" and state and state["headless"] == headless
+            and is_healthy(state["endpoint"])):
+        logger.info(f"Connecting to the browser daemon at {state['endpoint']}.")
+        return browser_type.connect_over_cdp(state["endpoint"])
+    return browser_type.launch(headless=headless)
+
+
+def run_daemon(headless, port=None):
+    port = port or Config.BROWSER_SERVER_PORT
+    endpoint = _endpoint(port)
+    running = True
+
+    def stop(signum, frame):
+        nonlocal running
+        running = False
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    with sync_playwright() as p:
+        while running:
+            browser = p.chromium.launch(headless=headless, args=[f"--remote-debugging-port={port}"])
+            started_at = time.time()
+            _write_state({"endpoint": endpoint, "pid": os.getpid(), "headless": headless, "started_at": started_at})
+            logger.info(f"Browser daemon serving {endpoint} ({'headless' if headless else 'headed'}).")
+            while running:
+                time.sleep(Config.BROWSER_SERVER_CHECK_S)
+                if not browser.is_connected() or not is_healthy(endpoint):
+                    logger.warning("Browser daemon failed its health check, relaunching.")
+                    break
+                if time.time() - started_at > Config.BROWSER_SERVER_MAX_AGE_S and is_idle(endpoint):
+                    logger.info("Browser daemon reached its maximum age, recycling.")
+                    break
+            if browser.is_connected():
+                browser.close()
+    if os.path.exists(Config.BROWSER_SERVER_STATE_FILE):
+        os.remove(Config.BROWSER_SERVER_STATE_FILE)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+    parser = argparse.ArgumentParser(description="Persistent browser reused across pytest runs.")
+    parser.add_argument("command", choices=["start", "status", "stop"])
+    parser.add_argument("--port", type=int, default=Config.BROWSER_SERVER_PORT)
+    args = parser.parse_args()
+    state = read_state()
+    if args.command == "start":
+        run_daemon(os.getenv('HEADLESS', 'false').lower() == 'true', args.port)
+    elif args.command == "status":
+        if state and is_healthy(state["endpoint"]):
+            print(f"Running at {state['endpoint']} for {(time.time() - state['started_at']) / 60:.0f} minutes "
+                  f"(pid {state['pid']}, {'headless' if state['headless'] else 'headed'}).")
+        else:
+            print("Not running.")
+            sys.exit(1)
+    elif state:
+        try:
+            os.kill(state["pid"], signal.SIGTERM)
+        except ProcessLookupError:
+            # The daemon died without cleaning up; its state file is stale
+            os.remove(Config.BROWSER_SERVER_STATE_FILE)
+            print(f"Browser daemon (pid {state['pid']}) was not running; removed its stale state file.")
@@ -0,0 +1,162 @@
+# catalog.py
+# Product catalog loaded from Config.CATALOG_FILE. Each product maps to the link it is opened
+# from in the search results and to its add-to-bag flow. Flows are compiled once when the catalog
+# is loaded, and lookups go through a normalized index instead of if/elif substring chains.
+#
+# A flow is either a "handler" (dotted path of a function taking the page, e.g.
+# "modules.iphone_actions.handle_iphone", plus an "async_handler" for async_runner.py)
+# or a declarative list of "steps", which compile for both sync and async pages:
+#
+#   {"click": "#noTradeIn_label"}                                  CSS selector
+#   {"click": {"role": "button", "name": "Add to Bag"}}            get_by_role
+#   {"click": {"text": "Connect to any carrier later$"}}           get_by_text
+#   {"click": {"label": "Buy, MacBook Pro"}}                       get_by_label
+#   {"click": {"css": "label", "has_text": "16-inch", "nth": 0}}   locator + filter + nth
+#   {"wait": {"role": "button", "name": "Review Bag"}, "budget_ms": 5000}
+#   {"screenshot": "MacBook_Pro.png"}
+
+import bisect
+import difflib
+import importlib
+import json
+import logging
+import re
+
+from config.config import Config
+from modules.readiness import async_wait_for_actionable, wait_for_actionable
+from modules.screenshots import async_capture, capture
+
+logger = logging.getLogger()
+
+_catalog = None
+
+
+def normalize(text):
+    """
+    Lowercase and keep only letters, digits and single spaces: "iPhone 16  Pro-Max" -> "iphone 16 pro max".
+    """
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", text.lower()).split())
+
+
+def _locator(page, spec):
+    if isinstance(spec, str):
+        return page.locator(spec)
+    if "role" in spec:
+        locator = page.get_by_role(spec["role"], name=spec.get("name"), exact=spec.get("exact", False))
+    elif "text" in spec:
+        locator = page.get_by_text(spec["text"])
+    elif "label" in spec:
+        locator = page.get_by_label(spec["label"])
+    else:
+        locator = page.locator(spec["css"])
+    if "has_text" in spec:
+        locator = locator.filter(has_text=spec["has_text"])
+    if "nth" in spec:
+        locator = locator.nth(spec["nth"])
+    return locator
+
+
+def _compile_step(product_name, step, is_async=False):
+    # Locators are created the same way on sync and async pages; with is_async the actions return coroutines
+    if "click" in step:
+        return lambda page: _locator(page, step["click"]).click()
+    if "wait" in step:
+        wait_name = step.get("name", f"{normalize(product_name).replace(' ', '_')}_wait")
+        wait = async_wait_for_actionable if is_async else wait_for_actionable
+        return lambda page: wait(_locator(page, step["wait"]), wait_name, step.get("budget_ms", 0))
+    if "screenshot" in step:
+        screenshot = async_capture if is_async else capture
+        return lambda page: screenshot(page, step["screenshot"])
+    raise ValueError(f"Unknown step {step} in the flow of '{product_name}'.")
+
+
+def _import(dotted_path):
+    module_name, function_name = dotted_path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def _compile_flow(entry):
+    if "handler" in entry:
+        return _import(entry["handler"])
+    compiled = [_compile_step(entry["name"], step) for step in entry["steps"]]
+
+    def add_to_bag(page):
+        logger.info(f"Handling {entry['name']} actions.")
+        for step in compiled:
+            step(page)
+
+    return add_to_bag
+
+
+def _compile_async_flow(entry):
+    if "async_handler" in entry:
+        return _import(entry["async_handler"])
+    if "steps" not in entry:
+        return None
+    compiled = [_compile_step(entry["name"], step, is_async=True) for step in entry["steps"]]
+
+    async def async_add_to_bag(page):
+        logger.info(f"Handling {entry['name']} actions.")
+        for step in compiled:
+            await step(page)
+
+    return async_add_to_bag
+
+
+class Product:
+    def __init__(self, entry):
+        self.name = entry["name"]
+        self.family = entry.get("family", "")
+        self.search_link = entry["search_link"]
+        self.add_to_bag = _compile_flow(entry)
+        self.async_add_to_bag = _compile_async_flow(entry)
+
+
+class Catalog:
+    """
+    Exact lookup by normalized name, then the shortest name starting with the query, then the shortest
+    name containing it (the interactive prompts always accepted part of a name, e.g. "16 Pro Max"),
+    then a fuzzy match.
+    """
+
+    def __init__(self, entries):
+        self.products = [Product(entry) for entry in entries]
+        self.by_name = {normalize(product.name): product for product in self.products}
+        self.sorted_names = sorted(self.by_name)
+
+    def find(self, query):
+        key = normalize(query)
+        if not key:
+            return None
+        if key in self.by_name:
+            return self.by_name[key]
+        start = bisect.bisect_left(self.sorted_names, key)
+        end = bisect.bisect_left(self.sorted_names, key + "\x7f")
+        if start < end:
+            return self.by_name[min(self.sorted_names[start:end], key=len)]
+        containing = [name for name in self.sorted_names if key in name]
+        if containing:
+            return self.by_name[min(containing, key=len)]
+        close = difflib.get_close_matches(key, self.sorted_names, n=1, cutoff=0.75)
+        return self.by_name[close[0]] if close else None
+
+    def get(self, query):
+        product = self.find(query)
+        if product is None:
+            raise ValueError(f"Product '{query}' is not in the catalog {Config.CATALOG_FILE}.")
+        return product
+
+    def names(self):
+        return [product.name for product in self.products]
+
+
+def load_catalog():
+    """
+    Load and compile the catalog once per process.
+    """
+    global _catalog
+    if _catalog is None:
+        with open(Config.CATALOG_FILE, encoding="utf-8") as f:
+            _catalog = Catalog(json.load(f)["products"])
+        logger.info(f"Loaded {len(_catalog.products)} products from {Config.CATALOG_FILE}.")
+    return _catalog
@@ -0,0 +1,152 @@
+# checkpoints.py
+# Step checkpointing: after every successful step the context's storage state, the current URL and
+# the step reached are saved. When pytest-rerunfailures retries a failed scenario in the same run
+# (CHECKPOINTS=true pytest --reruns 1) the last good checkpoint is restored and the steps before it
+# are skipped, so a failure in remove_product_from_bag does not replay the whole handle_iphone
+# configuration sequence. Only reruns resume: a first attempt always runs every step, and
+# checkpoints left by earlier runs are deleted when a run starts.
+#
+# Scenario data that lives in Python rather than in the browser (e.g. the BagWatcher's record of the
+# bag responses) is saved too: objects registered with track(name, obj) provide checkpoint_state()
+# and restore_checkpoint(state), and are restored with the page.
+#
+# Step functions opt in with @resumable (under the pytest-bdd decorator); the pytest-bdd hooks in
+# conftest.py drive the rest.
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+
+from config.config import Config
+
+logger = logging.getLogger()
+
+_checkpoint = None  # Checkpoint being resumed from, if any
+_step_index = 0
+_scenario_start = 0.0
+_failed = False
+_tracked = {}  # name -> object whose state is saved with every checkpoint
+
+
+def checkpoints_enabled():
+    return os.getenv('CHECKPOINTS', 'false').lower() == 'true'
+
+
+def clear_checkpoints():
+    """
+    Delete the checkpoints of earlier runs; called once when a run starts.
+    """
+    shutil.rmtree(Config.CHECKPOINT_DIR, ignore_errors=True)
+
+
+def _path(nodeid):
+    return os.path.join(Config.CHECKPOINT_DIR, f"{hashlib.sha1(nodeid.encode()).hexdigest()}.json")
+
+
+def _load(nodeid):
+    try:
+        with open(_path(nodeid)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def replaying():
+    """
+    True while the steps before the resumed checkpoint are being skipped.
+    """
+    return _checkpoint is not None and _step_index < _checkpoint["step_index"]
+
+
+def resumable(step_func):
+    """
+    Skip the step when the scenario is resumed from a checkpoint taken after it.
+    """
+    @functools.wraps(step_func)
+    def wrapper(*args, **kwargs):
+        if replaying():
+            logger.info(f"Skipping '{step_func.__name__}': restored from checkpoint.")
+            return None
+        return step_func(*args, **kwargs)
+
+    return wrapper
+
+
+def track(name, obj):
+    """
+    Save obj.checkpoint_state() with every checkpoint and restore it with obj.restore_checkpoint()
+    when resuming. An object registered while a resumed scenario skips its steps is restored at once.
+    """
+    _tracked[name] = obj
+    if replaying() and name in _checkpoint["data"]:
+        obj.restore_checkpoint(_checkpoint["data"][name])
+
+
+def start_scenario(item):
+    """
+    Resume from the item's checkpoint only when pytest-rerunfailures is retrying it.
+    """
+    global _checkpoint, _step_index, _scenario_start, _failed
+    _step_index, _scenario_start, _failed = 0, time.perf_counter(), False
+    rerun = getattr(item, "execution_count", 1) > 1
+    _checkpoint = _load(item.nodeid) if checkpoints_enabled() and rerun else None
+    if _checkpoint:
+        logger.info(f"Resuming {item.nodeid} after step {_checkpoint['step_index']} ({_checkpoint['step']}).")
+
+
+def before_step(page):
+    """
+    Restore the checkpoint's storage state and URL just before the first step that was not completed.
+    """
+    if _checkpoint is None or _step_index != _checkpoint["step_index"] or page is None:
+        return
+    state = _checkpoint["storage_state"]
+    page.context.add_cookies(state["cookies"])
+    for origin in state["origins"]:
+        page.goto(origin["origin"], wait_until="commit")
+        page.evaluate("items => items.forEach(item => localStorage.setItem(item.name, item.value))",
+                      origin["localStorage"])
+    page.goto(_checkpoint["url"], wait_until="domcontentloaded")
+    for name, obj in _tracked.items():
+        if name in _checkpoint["data"]:
+            obj.restore_checkpoint(_checkpoint["data"][name])
+    logger.info(f"Restored checkpoint at {_checkpoint['url']}, saved about {_checkpoint['elapsed']:.1f}s of replay.")
+
+
+def after_step(nodeid, step_name, page):
+    global _step_index
+    _step_index += 1
+    if not checkpoints_enabled() or page is None or replaying():
+        return
+    checkpoint = {
+        "nodeid": nodeid,
+        "step_index": _step_index,
+        "step": step_name,
+        "url": page.url,
+        "storage_state": page.context.storage_state(),
+        "data": {name: obj.checkpoint_state() for name, obj in _tracked.items()},
+        # Time the completed steps took, i.e. what a resumed retry does not have to replay
+        "elapsed": time.perf_counter() - _scenario_start + (_checkpoint["elapsed"] if _checkpoint else 0.0),
+    }
+    os.makedirs(Config.CHECKPOINT_DIR, exist_ok=True)
+    with open(_path(nodeid), 'w') as f:
+        json.dump(checkpoint, f)
+
+
+def step_failed():
+    global _failed
+    _failed = True
+
+
+def finish_scenario(nodeid):
+    """
+    A passed scenario needs no checkpoint; a failed one keeps its last good checkpoint for the retry.
+    """
+    global _checkpoint
+    if not _failed and os.path.exists(_path(nodeid)):
+        os.remove(_path(nodeid))
+    _checkpoint = None
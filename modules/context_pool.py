@@ -0,0 +1,136 @@
+# context_pool.py
+# Pool of pre-warmed browser contexts. Contexts are reset and reused between tests instead of
+# being created and closed for every test, and are evicted after too many uses or a failure.
+# A reset can only clear the storage of the origin its page is on, so a context whose frames
+# visited other origins is evicted too rather than reused with their storage. A reset also drops
+# the route handlers the test registered (network replay, resource blocking, asset cache).
+#
+# Used by the parallel-mode browser_setup fixture (one context per Examples row), the `page`
+# fixture in conftest.py and the load generator.
+
+import logging
+import time
+from urllib.parse import urlparse
+
+from config.config import Config
+
+logger = logging.getLogger()
+
+# Everything a page can store for its origin besides cookies and permissions
+CLEAR_ORIGIN_STORAGE_JS = """
+async () => {
+    localStorage.clear();
+    sessionStorage.clear();
+    if (indexedDB.databases) {
+        for (const db of await indexedDB.databases()) indexedDB.deleteDatabase(db.name);
+    }
+    if (window.caches) {
+        for (const key of await caches.keys()) await caches.delete(key);
+    }
+    if (navigator.serviceWorker) {
+        for (const registration of await navigator.serviceWorker.getRegistrations()) await registration.unregister();
+    }
+}
+"""
+
+
+def _origin(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}" if parsed.scheme in ("http", "https") else None
+
+
+class ContextPool:
+    """
+    acquire() hands out a context with one page on about:blank, release() resets it for the next test.
+    """
+
+    def __init__(self, browser, size=None, max_uses=None, viewport=None):
+        self.browser = browser
+        self.max_uses = max_uses or Config.CONTEXT_POOL_MAX_USES
+        self.viewport = viewport or Config.VIEWPORT
+        self.idle = []
+        self.uses = {}
+        self.origins = {}  # context -> origins its frames navigated to since the last reset
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.acquire_time = 0.0
+        for _ in range(size if size is not None else Config.CONTEXT_POOL_SIZE):
+            self.idle.append(self._new_context())
+
+    def _new_context(self):
+        context = self.browser.new_context(viewport=self.viewport)
+        origins = self.origins[context] = set()
+
+        def on_frame_navigated(frame):
+            origin = _origin(frame.url)
+            if origin:
+                origins.add(origin)
+
+        context.on("page", lambda page: page.on("framenavigated", on_frame_navigated))
+        context.new_page().goto("about:blank")
+        self.uses[context] = 0
+        return context
+
+    def acquire(self):
+        start = time.perf_counter()
+        if self.idle:
+            context = self.idle.pop()
+            self.hits += 1
+        else:
+            context = self._new_context()
+            self.misses += 1
+        self.uses[context] += 1
+        self.acquire_time += time.perf_counter() - start
+        return context
+
+    def release(self, context, failed=False):
+        if failed or self.uses[context] >= self.max_uses:
+            self._evict(context)
+            return
+        pages = context.pages
+        current = _origin(pages[0].url) if pages else None
+        if self.origins[context] - {current}:
+            # Storage of the other origins cannot be cleared from this page
+            self._evict(context)
+            return
+        try:
+            self._reset(context)
+        except Exception as e:
+            logger.warning(f"Could not reset browser context, evicting it: {e}")
+            self._evict(context)
+            return
+        self.idle.append(context)
+
+    def _reset(self, context):
+        # Keep one page, clear the storage of the origin it is on (the only one the context visited),
+        # then leave it on about:blank
+        pages = context.pages or [context.new_page()]
+        for extra_page in pages[1:]:
+            extra_page.close()
+        page = pages[0]
+        if _origin(page.url):
+            page.evaluate(CLEAR_ORIGIN_STORAGE_JS)
+        context.clear_cookies()
+        context.clear_permissions()
+        page.goto("about:blank")
+        context.unroute_all(behavior="ignoreErrors")
+        self.origins[context].clear()
+
+    def _evict(self, context):
+        self.evictions += 1
+        self.uses.pop(context, None)
+        self.origins.pop(context, None)
+        context.close()
+
+    def close(self):
+        for context in self.idle:
+            context.close()
+        self.idle = []
+        self.report()
+
+    def report(self):
+        acquired = self.hits + self.misses
+        average_ms = self.acquire_time / acquired * 1000 if acquired else 0.0
+        logger.info(f"Context pool: {self.hits} hits, {self.misses} misses, {self.evictions} evictions, "
+                    f"{self.acquire_time:.2f}s acquiring ({average_ms:.1f}ms per context).")
@@ -0,0 +1,94 @@
+# durations.py
+# Records how long each test took (setup + call + teardown) in Config.DURATIONS_FILE and estimates
+# durations for scheduling and sharding: the test's own history, else the average of its browser
+# engine, else a default (per step for pytest-bdd scenarios) scaled by the engine's factor.
+# Commit durations.json so CI shards can be planned from it.
+
+import json
+import logging
+import os
+
+from config.config import Config
+
+logger = logging.getLogger()
+
+SMOOTHING = 0.5  # Weight of the latest run in the recorded duration
+
+_history = None
+_current = {}
+
+
+def load_history():
+    global _history
+    if _history is None:
+        _history = {}
+        if os.path.exists(Config.DURATIONS_FILE):
+            try:
+                with open(Config.DURATIONS_FILE) as f:
+                    _history = json.load(f)
+            except (OSError, ValueError):
+                logger.warning(f"Ignoring unreadable durations file {Config.DURATIONS_FILE}.")
+    return _history
+
+
+def record(nodeid, seconds, engine=None):
+    entry = _current.setdefault(nodeid, {"seconds": 0.0, "engine": engine})
+    entry["seconds"] += seconds
+
+
+def save():
+    """
+    Merge this run's durations into the history file.
+    """
+    if not _current:
+        return
+    history = load_history()
+    for nodeid, entry in _current.items():
+        previous = history.get(nodeid)
+        seconds = entry["seconds"]
+        if previous:
+            seconds = SMOOTHING * seconds + (1 - SMOOTHING) * previous["seconds"]
+        history[nodeid] = {"seconds": round(seconds, 3), "engine": entry["engine"] or (previous or {}).get("engine")}
+    with open(Config.DURATIONS_FILE, 'w') as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+
+
+def engine_of(item):
+    callspec = getattr(item, "callspec", None)
+    return callspec.params.get("browser_name") if callspec else None
+
+
+def steps_of(item):
+    scenario = getattr(getattr(item, "function", None), "__scenario__", None)
+    return len(scenario.steps) if scenario is not None else None
+
+
+def estimate(nodeid, engine=None, steps=None):
+    history = load_history()
+    if nodeid in history:
+        return history[nodeid]["seconds"]
+    same_engine = [entry["seconds"] for entry in history.values() if engine and entry.get("engine") == engine]
+    if same_engine:
+        return sum(same_engine) / len(same_engine)
+    default = steps * Config.DEFAULT_STEP_SECONDS if steps else Config.DEFAULT_TEST_SECONDS
+    return default * Config.ENGINE_DURATION_FACTOR.get(engine, 1.0)
+
+
+def estimate_item(item):
+    return estimate(item.nodeid, engine_of(item), steps_of(item))
+
+
+def longest_first(items):
+    """
+    Sort items so the slowest start first; with pytest-xdist this keeps the total close to the slowest engine.
+    Items stay grouped by engine, slowest engine first: worker_browser is session-scoped per engine, so
+    interleaving engines would relaunch the browser on every switch.
+    """
+    per_engine = {}
+    for item in items:
+        engine = engine_of(item) or "default"
+        per_engine[engine] = per_engine.get(engine, 0.0) + estimate_item(item)
+    items.sort(key=lambda item: (-per_engine[engine_of(item) or "default"], engine_of(item) or "default",
+                                 -estimate_item(item)))
+    for engine, seconds in sorted(per_engine.items()):
+        logger.info(f"Expected {engine} time: {seconds:.0f}s.")
@@ -0,0 +1,149 @@
+# feature_cache.py
+# Compiled feature files cached on disk, keyed by the hash of the file's content and the pytest-bdd
+# version, so collection unpickles the parsed feature instead of parsing the Gherkin again.
+# prepare() seeds pytest-bdd's own in-process feature cache, and the scenarios() call that follows
+# uses it.
+#
+# Lazy expansion: with --shard i/n in parallel mode, Examples tables of at least
+# Config.FEATURE_LAZY_MIN_ROWS rows are cut down to this shard's rows (a stable hash of the row)
+# before pytest-bdd expands them, so a CI job only builds the tests it runs. pytest-xdist needs
+# every worker to collect the same tests, so the split is per --shard job, not per xdist worker.
+# shard_rows() counts the split rows of every shard, for the per-shard summary in conftest.py.
+
+import hashlib
+import logging
+import os
+import pickle
+import time
+import zlib
+from importlib.metadata import version
+
+from pytest_bdd.feature import features
+from pytest_bdd.parser import parse_feature
+from pytest_bdd.scenario import get_features_base_dir
+
+from config.config import Config
+
+logger = logging.getLogger()
+
+_shard = None  # (index, count) when Examples rows are split before expansion
+_sharded_features = set()
+_shard_rows = []  # Split Examples rows per shard
+_stats = {"hits": 0, "misses": 0, "saved": 0.0, "rows": 0, "skipped_rows": 0}
+
+
+def set_shard(index, count):
+    global _shard
+    _shard = (index, count)
+    _shard_rows[:] = [0] * count
+
+
+def shard_rows():
+    """
+    Number of Examples rows each shard got from the split tables; empty when nothing is split.
+    """
+    return list(_shard_rows) if _sharded_features else []
+
+
+def _cache_path(content):
+    key = hashlib.sha256(content + version("pytest-bdd").encode()).hexdigest()
+    return os.path.join(Config.FEATURE_CACHE_DIR, f"{key}.pickle")
+
+
+def _load(path):
+    with open(path, 'rb') as f:
+        content = f.read()
+    cache_path = _cache_path(content)
+    start = time.perf_counter()
+    try:
+        with open(cache_path, 'rb') as f:
+            parse_seconds, feature = pickle.load(f)
+        _stats["hits"] += 1
+        _stats["saved"] += parse_seconds - (time.perf_counter() - start)
+        return feature
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass
+
+    start = time.perf_counter()
+    feature = parse_feature(os.path.dirname(path), os.path.basename(path))
+    parse_seconds = time.perf_counter() - start
+    _stats["misses"] += 1
+    try:
+        os.makedirs(Config.FEATURE_CACHE_DIR, exist_ok=True)
+        tmp_file = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_file, 'wb') as f:
+            pickle.dump((parse_seconds, feature), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_path)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+        logger.warning(f"Could not cache the compiled feature {path}: {e}")
+    return feature
+
+
+def _row_shard(row):
+    return zlib.crc32("\x1f".join(row).encode()) % _shard[1] + 1
+
+
+def _in_shard(row):
+    return _row_shard(row) == _shard[0]
+
+
+def _split_examples(feature):
+    for scenario in feature.scenarios.values():
+        examples = scenario.examples
+        if not examples or not examples.examples:
+            continue
+        _stats["rows"] += len(examples.examples)
+        if _shard is None or len(examples.examples) < Config.FEATURE_LAZY_MIN_ROWS:
+            continue
+        for row in examples.examples:
+            _shard_rows[_row_shard(row) - 1] += 1
+        kept = [row for row in examples.examples if _in_shard(row)]
+        _stats["skipped_rows"] += len(examples.examples) - len(kept)
+        examples.examples = kept
+        _sharded_features.add(feature.filename)
+
+
+def _replace_examples(feature, rows):
+    """
+    Use `rows` (dicts, e.g. from product_dataset.py) as the Examples of every outline whose columns they have.
+    """
+    for scenario in feature.scenarios.values():
+        examples = scenario.examples
+        if examples and examples.example_params and all(param in rows[0] for param in examples.example_params):
+            examples.examples = [[row[param] for param in examples.example_params] for row in rows]
+
+
+def prepare(test_file, feature_path, rows=None, features_base_dir=None):
+    """
+    Load the compiled feature `feature_path` (as given to scenarios() in `test_file`) into pytest-bdd's
+    feature cache. Call it just before scenarios(), with the same features_base_dir if one is passed
+    there; otherwise the path is resolved like pytest-bdd does, against the bdd_features_base_dir ini
+    option or the test file's directory. `rows` replaces the Examples.
+    """
+    base_dir = features_base_dir if features_base_dir is not None else get_features_base_dir(test_file)
+    path = os.path.abspath(os.path.join(base_dir, feature_path))
+    if path in features:
+        return
+    feature = _load(path)
+    if rows:
+        _replace_examples(feature, rows)
+    _split_examples(feature)
+    features[path] = feature
+
+
+def prefiltered(item):
+    """
+    True for an Examples row test that was already assigned to this shard before expansion.
+    """
+    scenario = getattr(getattr(item, "function", None), "__scenario__", None)
+    callspec = getattr(item, "callspec", None)
+    return (scenario is not None and callspec is not None and "_pytest_bdd_example" in callspec.params
+            and scenario.feature.filename in _sharded_features)
+
+
+def report():
+    if not _stats["hits"] and not _stats["misses"]:
+        return
+    logger.info(f"Feature cache: {_stats['hits']} hits, {_stats['misses']} misses, "
+                f"{max(_stats['saved'], 0.0) * 1000:.0f}ms of parsing saved; lazy expansion skipped "
+                f"{_stats['skipped_rows']} of {_stats['rows']} Examples rows.")
@@ -0,0 +1,177 @@
+# instrumentation.py
+# Per-step latency and network instrumentation. The pytest-bdd step hooks in conftest.py open and
+# close steps; an instrumented page times every Playwright action (waiting vs acting) and counts
+# the requests and bytes of each step. Results are exported as JSON and shown as a per-scenario
+# timeline in the pytest-html report.
+
+import html
+import json
+import logging
+import os
+import time
+
+from config.config import Config
+from modules.run_log import worker_id
+
+logger = logging.getLogger()
+
+# Page/Locator methods that only wait; every other call counts as acting, except trial actions
+# (click(trial=True) and the like only check actionability)
+WAIT_PREFIXES = ("wait_for", "expect_")
+# Short sleeps that polling helpers (RequestTracker, BagWatcher) repeat every few ms; they count as
+# waiting but are folded into one entry per step instead of one action per poll
+POLLING_METHODS = {"wait_for_timeout"}
+# Methods returning a locator that should be instrumented as well
+LOCATOR_FACTORIES = {"locator", "get_by_role", "get_by_text", "get_by_label", "get_by_placeholder",
+                     "get_by_alt_text", "get_by_title", "get_by_test_id", "filter", "nth", "first", "last",
+                     "and_", "or_"}
+
+_scenarios = []
+_current_scenario = None
+_current_step = None
+
+
+def instrumentation_enabled():
+    return os.getenv('INSTRUMENTATION', 'true').lower() == 'true'
+
+
+def start_scenario(name):
+    global _current_scenario
+    _current_scenario = {"scenario": name, "worker": worker_id(), "start": time.time(), "steps": []}
+    _scenarios.append(_current_scenario)
+
+
+def finish_scenario():
+    """
+    Close the current scenario and return its record.
+    """
+    global _current_scenario
+    scenario, _current_scenario = _current_scenario, None
+    if scenario is not None:
+        scenario["duration"] = round(time.time() - scenario["start"], 3)
+    return scenario
+
+
+def start_step(name):
+    global _current_step
+    _current_step = {"step": name, "offset": 0.0, "duration": 0.0, "wait": 0.0, "act": 0.0,
+                     "requests": 0, "bytes": 0, "actions": [], "_start": time.time()}
+    if _current_scenario is not None:
+        _current_step["offset"] = round(_current_step["_start"] - _current_scenario["start"], 3)
+        _current_scenario["steps"].append(_current_step)
+
+
+def finish_step(status="passed"):
+    global _current_step
+    step, _current_step = _current_step, None
+    if step is not None:
+        step["duration"] = round(time.time() - step.pop("_start"), 3)
+        step["status"] = status
+        step["wait"], step["act"] = round(step["wait"], 3), round(step["act"], 3)
+
+
+def _record_action(name, duration, trial=False):
+    if _current_step is None:
+        return
+    kind = "wait" if trial or name.startswith(WAIT_PREFIXES) else "act"
+    _current_step[kind] += duration
+    actions = _current_step["actions"]
+    if name in POLLING_METHODS:
+        polling = next((action for action in actions if action["action"] == name), None)
+        if polling is not None:
+            polling["duration"] = round(polling["duration"] + duration, 3)
+            polling["calls"] += 1
+        else:
+            actions.append({"action": name, "kind": kind, "duration": round(duration, 3), "calls": 1})
+        return
+    actions.append({"action": f"{name}(trial)" if trial else name, "kind": kind, "duration": round(duration, 3)})
+
+
+def _on_request_finished(request):
+    if _current_step is None:
+        return
+    _current_step["requests"] += 1
+    try:
+        _current_step["bytes"] += request.sizes()["responseBodySize"]
+    except Exception:
+        pass
+
+
+class _Instrumented:
+    """
+    Proxy that times the calls made on a Playwright Page or Locator.
+    """
+
+    def __init__(self, target):
+        self._target = target
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if not callable(attribute):
+            if name in LOCATOR_FACTORIES:  # first / last are properties
+                return _Instrumented(attribute)
+            return attribute
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = attribute(*args, **kwargs)
+            if name in LOCATOR_FACTORIES:
+                return _Instrumented(result)
+            _record_action(name, time.perf_counter() - start, trial=kwargs.get("trial", False))
+            return result
+
+        return timed
+
+
+def instrument(page):
+    """
+    Count the page's requests per step and return a proxy timing its actions.
+    Returns the page unchanged when INSTRUMENTATION=false.
+    """
+    if not instrumentation_enabled():
+        return page
+    page.on("requestfinished", _on_request_finished)
+    return _Instrumented(page)
+
+
+def uninstrument(page):
+    """
+    Stop counting the requests of a page returned by instrument(), e.g. before its context is reused.
+    """
+    if isinstance(page, _Instrumented):
+        page._target.remove_listener("requestfinished", _on_request_finished)
+
+
+def export():
+    """
+    Write the recorded scenarios of this process to Config.INSTRUMENTATION_FILE.
+    """
+    if not _scenarios:
+        return None
+    path = Config.INSTRUMENTATION_FILE.format(worker=worker_id())
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(_scenarios, f, indent=2)
+    logger.info(f"Step instrumentation for {len(_scenarios)} scenarios written to {path}.")
+    return path
+
+
+def timeline_html(scenario):
+    """
+    Render a scenario as a horizontal bar per step for the pytest-html report.
+    """
+    total = max(scenario.get("duration") or 0.0, 0.001)
+    rows = []
+    for step in scenario["steps"]:
+        left = step["offset"] / total * 100
+        width = max(step["duration"] / total * 100, 0.5)
+        color = "#c0392b" if step.get("status") == "failed" else "#2e86c1"
+        rows.append(
+            f'<tr><td style="padding-right:8px;white-space:nowrap">{html.escape(step["step"])}</td>'
+            f'<td style="width:60%"><div style="position:relative;height:12px;background:#f0f0f0">'
+            f'<div style="position:absolute;left:{left:.1f}%;width:{width:.1f}%;height:12px;background:{color}"></div>'
+            f'</div></td><td style="padding-left:8px;white-space:nowrap">{step["duration"]:.2f}s '
+            f'(wait {step["wait"]:.2f}s, act {step["act"]:.2f}s, {step["requests"]} requests, '
+            f'{step["bytes"] / 1024:.0f} KiB)</td></tr>'
+        )
+    return f'<table style="width:100%">{"".join(rows)}</table>'
@@ -5,6 +5,10 @@
 
 import logging
 
+from modules.readiness import wait_for_actionable
+from modules.screenshots import capture
+from modules.locator_cache import cached
+
 logger = logging.getLogger()
 
 
@@ -13,17 +17,19 @@ def handle_iphone(page):
     Handle actions related to iPhone 16 Pro Max.has_text="256GB Footnote ² From $1099"
     """
     logger.info("Handling iPhone 16 Pro Max actions.")
-    page.wait_for_timeout(10000)
     # page.locator("section").filter(has_text="iPhone 16 Pro Hello, Apple").get_by_label("Buy iPhone 16 Pro").click()
-    page.locator("section:has-text('iPhone 16 Pro Hello, Apple')").locator('a[aria-label="Buy iPhone 16 Pro"]').nth(0).click(timeout=60000)
-    page.locator("label").filter(has_text="iPhone 16 Pro 6.3-inch").click()
-    page.locator("label").filter(has_text="Desert Titanium").locator("img").click()
-    page.locator("label").filter(has_text="256GB Footnote ² From $1099").click()
+    # Text-matching locators are resolved through the locator cache, which swaps them for stable selectors
+    buy_link = cached(page, "iphone_buy_link", lambda: page.locator("section:has-text('iPhone 16 Pro Hello, Apple')").locator('a[aria-label="Buy iPhone 16 Pro"]').nth(0))
+    wait_for_actionable(buy_link, "iphone_buy_link", fixed_budget_ms=10000)
+    buy_link.click(timeout=60000)
+    cached(page, "iphone_model_label", lambda: page.locator("label").filter(has_text="iPhone 16 Pro 6.3-inch")).click()
+    cached(page, "iphone_color_image", lambda: page.locator("label").filter(has_text="Desert Titanium").locator("img")).click()
+    cached(page, "iphone_capacity_label", lambda: page.locator("label").filter(has_text="256GB Footnote ² From $1099")).click()
     page.locator("#noTradeIn_label").click()
-    page.get_by_text("Buy$1,099.00Pay with Apple").click()
-    page.get_by_text("Connect to any carrier later$").click()
+    cached(page, "iphone_payment_option", lambda: page.get_by_text("Buy$1,099.00Pay with Apple")).click()
+    cached(page, "iphone_carrier_option", lambda: page.get_by_text("Connect to any carrier later$")).click()
     page.locator("#applecareplus_58_noapplecare_label").click()
     page.get_by_role("button", name="Add to Bag").click()
-    page.wait_for_timeout(5000)
-    page.screenshot(path='screenshots/iPhone 16 Pro Max.png')
+    wait_for_actionable(page.get_by_role("button", name="Review Bag"), "iphone_added_to_bag", fixed_budget_ms=5000)
+    capture(page, 'iPhone 16 Pro Max.png')
     logger.info("Screenshot of iPhone 16 Pro Max taken.")
@@ -0,0 +1,272 @@
+# load_generator.py
+# Closed-loop load and soak runs built on the steps of the BDD flow (modules/search_flow.py, which
+# tests/test_parameter_apple_search_module.py runs as its BDD steps). Every virtual user runs the journey (homepage, search,
+# add to bag, review bag, remove, return home) back to back in a thread of its own, on contexts
+# from its ContextPool. The number of active users ramps through Config.LOAD_STAGES. Per-step latency
+# histograms, throughput over time and per stage, and the saturation point (the stage after which
+# more users stop adding throughput) are logged and written to Config.LOAD_REPORT_FILE.
+# The run fails (non-zero exit) when a virtual user crashes, a stage completes no journey, or more
+# than Config.LOAD_MAX_ERROR_RATE of a stage's journeys fail.
+#
+# Playwright's sync API is bound to the thread that started it, so each user starts its own
+# Playwright; with the browser daemon running (modules/browser_server.py) they share its Chromium.
+#
+# python -m modules.load_generator                                   -> ramp 1, 2, 4, 8 users, 60s each
+# python -m modules.load_generator --stages 4 --stage-seconds 3600   -> one-hour soak with 4 users
+# python -m modules.load_generator --url http://127.0.0.1:8000/       -> against an already running storefront
+
+import argparse
+import bisect
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from playwright.sync_api import sync_playwright
+
+from config.config import Config
+from modules.browser_server import connect_or_launch
+from modules.context_pool import ContextPool
+from modules.request_tracker import RequestTracker
+from modules import search_flow as steps
+from modules.storefront import Storefront
+
+logger = logging.getLogger()
+
+PRODUCTS = ["iPhone 16 Pro", "MacBook Pro"]
+
+
+class Histogram:
+    """
+    Latency counts per bucket of Config.LOAD_HISTOGRAM_BUCKETS_MS; constant memory for soak runs.
+    """
+
+    def __init__(self):
+        self.bounds = Config.LOAD_HISTOGRAM_BUCKETS_MS
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, fraction):
+        """
+        Upper bound of the bucket holding the percentile.
+        """
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds + [self.max_ms], self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self):
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {"count": self.count, "mean_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+                "p50_ms": self.percentile(0.5), "p95_ms": self.percentile(0.95), "max_ms": round(self.max_ms, 1),
+                "buckets": dict(zip(labels, self.counts))}
+
+
+class LoadRun:
+    """
+    Shared state of a load run: active user count and the recorded results.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.done = False
+        self.started = time.perf_counter()
+        self.steps = {}  # step -> Histogram
+        self.intervals = {}  # interval number -> [journeys passed, journeys failed]
+        self.crashes = []  # Virtual users that could not start or stopped on an error
+
+    def record_step(self, step, seconds):
+        with self.lock:
+            self.steps.setdefault(step, Histogram()).add(seconds * 1000)
+
+    def record_journey(self, passed):
+        interval = int((time.perf_counter() - self.started) // Config.LOAD_INTERVAL_S)
+        with self.lock:
+            counts = self.intervals.setdefault(interval, [0, 0])
+            counts[0 if passed else 1] += 1
+
+    def record_crash(self, number, error):
+        with self.lock:
+            self.crashes.append(f"virtual user {number}: {error}")
+
+    def journeys(self):
+        with self.lock:
+            return sum(passed for passed, _ in self.intervals.values())
+
+    def failures(self):
+        with self.lock:
+            return sum(failed for _, failed in self.intervals.values())
+
+
+def run_journey(page, product, run):
+    """
+    One user journey through the step functions, timing each step.
+    """
+    tracker = RequestTracker(page)
+    journey = [
+        ("visit_apple_com", lambda: steps.visit_apple_com(page, tracker)),
+        ("search_for_product", lambda: steps.search_for_product(page, tracker, product)),
+        ("add_product_to_bag", lambda: steps.add_product_to_bag(page, product)),
+        ("proceed_to_review_bag", lambda: steps.proceed_to_review_bag(page, tracker)),
+        ("remove_product_from_bag", lambda: steps.remove_product_from_bag(page, product)),
+        ("return_to_homepage", lambda: steps.return_to_homepage(page, tracker)),
+    ]
+    try:
+        for name, step in journey:
+            start = time.perf_counter()
+            step()
+            run.record_step(name, time.perf_counter() - start)
+    finally:
+        tracker.detach()
+
+
+def _virtual_user(number, run, products, headless):
+    try:
+        _run_user(number, run, products, headless)
+    except Exception as e:
+        run.record_crash(number, e)
+        logger.error(f"Virtual user {number} stopped: {e}")
+
+
+def _run_user(number, run, products, headless):
+    with sync_playwright() as p:
+        browser = connect_or_launch(p.chromium, headless)
+        pool = ContextPool(browser, size=1)
+        iteration = 0
+        while not run.done:
+            if number >= run.active:
+                time.sleep(0.1)
+                continue
+            context = pool.acquire()
+            failed = False
+            try:
+                run_journey(context.pages[0], products[(number + iteration) % len(products)], run)
+            except Exception as e:
+                failed = True
+                logger.warning(f"Virtual user {number}: journey failed: {e}")
+            pool.release(context, failed=failed)
+            run.record_journey(not failed)
+            iteration += 1
+        pool.close()
+        browser.close()
+
+
+def saturation_point(stages):
+    """
+    The last stage whose users still added at least Config.LOAD_SATURATION_GAIN throughput, or None
+    when throughput kept growing through the last stage.
+    """
+    for previous, stage in zip(stages, stages[1:]):
+        if stage["journeys_per_minute"] < previous["journeys_per_minute"] * (1 + Config.LOAD_SATURATION_GAIN):
+            return previous["users"]
+    return None
+
+
+def run_load(stages=None, stage_seconds=None, products=None, headless=True, report_file=None):
+    stages = stages or Config.LOAD_STAGES
+    stage_seconds = stage_seconds or Config.LOAD_STAGE_SECONDS
+    products = products or PRODUCTS
+    run = LoadRun()
+    users = [threading.Thread(target=_virtual_user, args=(number, run, products, headless), daemon=True,
+                              name=f"virtual-user-{number}") for number in range(max(stages))]
+    for user in users:
+        user.start()
+
+    results = []
+    for count in stages:
+        run.active = count
+        journeys_before, failures_before, start = run.journeys(), run.failures(), time.perf_counter()
+        time.sleep(stage_seconds)
+        journeys, failed = run.journeys() - journeys_before, run.failures() - failures_before
+        per_minute = journeys / (time.perf_counter() - start) * 60
+        results.append({"users": count, "journeys": journeys, "failed": failed,
+                        "journeys_per_minute": round(per_minute, 2)})
+        logger.info(f"{count} users: {journeys} journeys, {failed} failed, {per_minute:.1f} per minute.")
+    run.done = True
+    for user in users:
+        user.join()
+
+    report = {
+        "stages": results,
+        "saturation_users": saturation_point(results),
+        "steps": {step: histogram.to_dict() for step, histogram in sorted(run.steps.items())},
+        "throughput": [{"start_s": interval * Config.LOAD_INTERVAL_S, "passed": passed, "failed": failed}
+                       for interval, (passed, failed) in sorted(run.intervals.items())],
+        "crashes": run.crashes,
+    }
+    report["problems"] = problems(report)
+    for step, histogram in report["steps"].items():
+        logger.info(f"{step}: p50 {histogram['p50_ms']}ms, p95 {histogram['p95_ms']}ms, "
+                    f"max {histogram['max_ms']}ms over {histogram['count']} runs.")
+    if report["saturation_users"] is None:
+        logger.info("Throughput still grew at the last stage; add stages to find the saturation point.")
+    else:
+        logger.info(f"Throughput saturates at {report['saturation_users']} concurrent users.")
+    report_file = report_file or Config.LOAD_REPORT_FILE
+    if os.path.dirname(report_file):
+        os.makedirs(os.path.dirname(report_file), exist_ok=True)
+    with open(report_file, 'w') as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Load report written to {report_file}.")
+    for problem in report["problems"]:
+        logger.error(f"Load run failed: {problem}.")
+    return report
+
+
+def problems(report):
+    """
+    Why the run does not count as a valid measurement: crashed users, stages without a passed journey,
+    or stages whose error rate is over Config.LOAD_MAX_ERROR_RATE.
+    """
+    found = list(report["crashes"])
+    for stage in report["stages"]:
+        attempts = stage["journeys"] + stage["failed"]
+        if not stage["journeys"]:
+            found.append(f"no journey passed with {stage['users']} users")
+        elif stage["failed"] / attempts > Config.LOAD_MAX_ERROR_RATE:
+            found.append(f"{stage['failed']} of {attempts} journeys failed with {stage['users']} users")
+    return found
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(threadName)s - %(message)s",
+                        datefmt="%Y-%m-%d %H:%M:%S")
+    parser = argparse.ArgumentParser(description="Closed-loop load and soak runs of the BDD user journey.")
+    parser.add_argument("--stages", default=",".join(map(str, Config.LOAD_STAGES)),
+                        help="comma-separated concurrent users per stage")
+    parser.add_argument("--stage-seconds", type=int, default=Config.LOAD_STAGE_SECONDS)
+    parser.add_argument("--products", nargs="+", default=PRODUCTS, help="product names from the catalog")
+    parser.add_argument("--url", help="storefront to load instead of starting the stand-in storefront")
+    parser.add_argument("--report-file", default=Config.LOAD_REPORT_FILE)
+    args = parser.parse_args()
+    headless = os.getenv('HEADLESS', 'true').lower() == 'true'
+    stage_users = [int(count) for count in args.stages.split(",")]
+
+    # Keep the load run's screenshots, wait latencies and cached selectors out of the test run's files
+    scratch = tempfile.mkdtemp(prefix="load_")
+    Config.SCREENSHOT_DIR = os.path.join(scratch, "screenshots")
+    Config.READINESS_LATENCY_FILE = os.path.join(scratch, "readiness_latencies.json")
+    Config.LOCATOR_CACHE_FILE = os.path.join(scratch, "locator_cache.json")
+    if args.url:
+        Config.HOMEPAGE_URL = args.url
+        report = run_load(stage_users, args.stage_seconds, args.products, headless, args.report_file)
+    else:
+        with Storefront() as url:
+            Config.HOMEPAGE_URL = url
+            report = run_load(stage_users, args.stage_seconds, args.products, headless, args.report_file)
+    sys.exit(1 if report["problems"] else 0)
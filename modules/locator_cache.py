@@ -0,0 +1,126 @@
+# locator_cache.py
+# Turns expensive text-matching locators (e.g. locator("label").filter(has_text="256GB Footnote ² From $1099"))
+# into cheap, stable selectors. On first success the matched element's id, data-autom attribute or a
+# short CSS path is recorded with the element's text, keyed by page path and DOM fingerprint, and persisted
+# for later runs. If a cached selector no longer matches exactly one element, or that element's text changed
+# (a nth-of-type path can land on a sibling), the text locator is used and the cache refreshed.
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from urllib.parse import urlparse
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from config.config import Config
+
+logger = logging.getLogger()
+
+# Shortest unique selector for an element: its id, its data-autom, else a nth-of-type path up to
+# the nearest ancestor with a unique id or data-autom
+STABLE_SELECTOR_JS = """
+el => {
+    const unique = selector => document.querySelectorAll(selector).length === 1;
+    const anchor = node => {
+        if (node.id && unique('#' + CSS.escape(node.id))) return '#' + CSS.escape(node.id);
+        const autom = node.getAttribute('data-autom');
+        if (autom && unique(`[data-autom="${autom}"]`)) return `[data-autom="${autom}"]`;
+        return null;
+    };
+    const parts = [];
+    for (let node = el; node && node !== document.documentElement; node = node.parentElement) {
+        const found = anchor(node);
+        if (found) { parts.unshift(found); break; }
+        let index = 1;
+        for (let sibling = node.previousElementSibling; sibling; sibling = sibling.previousElementSibling) {
+            if (sibling.tagName === node.tagName) index++;
+        }
+        parts.unshift(`${node.tagName.toLowerCase()}:nth-of-type(${index})`);
+    }
+    return parts.join(' > ');
+}
+"""
+
+# Script bundle paths change with every site deploy, so they identify the DOM's version. Only the path is
+# used: the host and port differ between runs against a local storefront.
+FINGERPRINT_JS = "() => Array.from(document.scripts, s => s.src && new URL(s.src).pathname).filter(Boolean).join('|')"
+
+_cache = None
+_lock = threading.Lock()  # Load runs drive pages from several threads
+_fingerprints = {}
+hits = 0
+misses = 0
+
+
+def cache_enabled():
+    return os.getenv('LOCATOR_CACHE', 'true').lower() == 'true'
+
+
+def _load_cache():
+    global _cache
+    if _cache is None:
+        _cache = {}
+        if os.path.exists(Config.LOCATOR_CACHE_FILE):
+            try:
+                with open(Config.LOCATOR_CACHE_FILE) as f:
+                    _cache = json.load(f)
+            except (OSError, ValueError):
+                logger.warning(f"Ignoring unreadable locator cache {Config.LOCATOR_CACHE_FILE}.")
+    return _cache
+
+
+def _text(locator):
+    return " ".join(locator.text_content().split())
+
+
+def _store(key, name, selector, text):
+    with _lock:
+        _load_cache().setdefault(key, {})[name] = {"selector": selector, "text": text}
+        tmp_file = f"{Config.LOCATOR_CACHE_FILE}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(_cache, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, Config.LOCATOR_CACHE_FILE)
+
+
+def _page_key(page):
+    url = page.url
+    if url not in _fingerprints:
+        scripts = page.evaluate(FINGERPRINT_JS)
+        _fingerprints[url] = hashlib.sha1(scripts.encode()).hexdigest()[:12]
+    return f"{urlparse(url).path}|{_fingerprints[url]}"
+
+
+def cached(page, name, fallback):
+    """
+    Return a locator for the element called `name` on this page: the cached stable selector when it
+    still matches exactly one element with the recorded text, otherwise `fallback()` (and cache a
+    stable selector for it).
+    """
+    global hits, misses
+    if not cache_enabled():
+        return fallback()
+    key = _page_key(page)
+    entry = _load_cache().get(key, {}).get(name)
+    if isinstance(entry, dict):
+        candidate = page.locator(entry["selector"])
+        try:
+            candidate.first.wait_for(state="attached", timeout=Config.LOCATOR_CACHE_PROBE_MS)
+            if candidate.count() == 1 and _text(candidate) == entry["text"]:
+                hits += 1
+                return candidate
+        except PlaywrightTimeoutError:
+            pass
+        logger.info(f"Cached selector for '{name}' no longer matches, falling back to the text locator.")
+
+    misses += 1
+    locator = fallback()
+    locator.wait_for(state="attached")
+    _store(key, name, locator.evaluate(STABLE_SELECTOR_JS), _text(locator))
+    return locator
+
+
+def report():
+    if hits or misses:
+        logger.info(f"Locator cache: {hits} hits, {misses} misses.")
@@ -4,6 +4,10 @@
 # This will make the code cleaner and more modular.
 import logging
 
+from modules.readiness import wait_for_actionable
+from modules.screenshots import capture
+from modules.locator_cache import cached
+
 logger = logging.getLogger()
 
 
@@ -12,11 +16,12 @@ def handle_macbook(page):
     Handle actions related to MacBook Pro.
     """
     logger.info("Handling MacBook Pro actions.")
-    page.locator("section").filter(has_text="MacBook Pro Mind-blowing.Head").get_by_label("Buy, MacBook Pro").click()
+    # Text-matching locators are resolved through the locator cache, which swaps them for stable selectors
+    cached(page, "macbook_buy_link", lambda: page.locator("section").filter(has_text="MacBook Pro Mind-blowing.Head").get_by_label("Buy, MacBook Pro")).click()
     page.get_by_role("radio", name="16-inch").click()
     page.get_by_role("tab", name="M3 Pro").click()
-    page.get_by_role("button", name="Select Apple M3 Pro with 12-").nth(1).click()
+    cached(page, "macbook_chip_option", lambda: page.get_by_role("button", name="Select Apple M3 Pro with 12-").nth(1)).click()
     page.get_by_role("button", name="Add to Bag").click()
-    page.wait_for_timeout(5000)
-    page.screenshot(path='screenshots/MacBook_Pro.png')
+    wait_for_actionable(page.get_by_role("button", name="Review Bag"), "macbook_added_to_bag", fixed_budget_ms=5000)
+    capture(page, 'MacBook_Pro.png')
     logger.info("Screenshot of MacBook Pro taken.")
@@ -0,0 +1,179 @@
+# network_archive.py
+# Record the traffic of each flow (homepage, search, product, buy, bag) into versioned HAR archives
+# and replay it from a route handler, so runs do not depend on Apple's CDN.
+#
+# NETWORK_MODE=record pytest tests/test_parameter_apple_search_module.py   -> writes har/<version>/<flow>.har
+# NETWORK_MODE=replay pytest tests/test_parameter_apple_search_module.py   -> serves requests from the archives
+#
+# Recording needs a single process: each flow's archive is written whole, so xdist workers would
+# overwrite each other's. Replay works with any number of workers.
+
+import base64
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+
+from config.config import Config
+
+logger = logging.getLogger()
+
+# Headers that describe the original transfer, not the decoded body we fulfill with
+SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def network_mode():
+    return os.getenv('NETWORK_MODE', 'live').lower()
+
+
+def archive_dir():
+    return os.path.join(Config.HAR_DIR, Config.HAR_VERSION)
+
+
+def flow_for(page_url):
+    for flow, pattern in Config.HAR_FLOWS:
+        if fnmatch.fnmatch(page_url, pattern):
+            return flow
+    return "homepage"
+
+
+def body_hash(body):
+    return hashlib.sha1(body or b"").hexdigest()
+
+
+class NetworkRecorder:
+    """
+    Collects finished requests of a context per flow and writes them as HAR files on save().
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self.entries = {}
+        context.on("requestfinished", self._on_request_finished)
+
+    def _on_request_finished(self, request):
+        response = request.response()
+        if response is None:
+            return
+        try:
+            body = response.body()
+        except Exception:
+            # Redirects have no body but are recorded with their Location header, so replay follows them
+            if not 300 <= response.status < 400:
+                return
+            body = b""
+        page_url = request.url if request.is_navigation_request() else request.frame.page.url
+        self.entries.setdefault(flow_for(page_url), []).append({
+            "request": {
+                "method": request.method,
+                "url": request.url,
+                "_bodyHash": body_hash(request.post_data_buffer),
+            },
+            "response": {
+                "status": response.status,
+                "headers": [{"name": k, "value": v} for k, v in response.headers.items()],
+                "content": {
+                    "mimeType": response.headers.get("content-type", ""),
+                    "text": base64.b64encode(body).decode("ascii"),
+                    "encoding": "base64",
+                },
+            },
+        })
+
+    def save(self):
+        os.makedirs(archive_dir(), exist_ok=True)
+        for flow, entries in self.entries.items():
+            path = os.path.join(archive_dir(), f"{flow}.har")
+            with open(path, 'w') as f:
+                json.dump({"log": {"version": "1.2", "creator": {"name": "network_archive"}, "entries": entries}}, f)
+            logger.info(f"Recorded {len(entries)} requests for flow '{flow}' to {path}.")
+
+
+class NetworkReplayer:
+    """
+    Serves requests from the recorded archives. Lookup is by (method, URL, body hash),
+    falling back to (method, URL). A key recorded several times (e.g. a polled bag endpoint) replays
+    its responses in recorded order, repeating the last one. Requests missing from the archive are
+    aborted and reported.
+    """
+
+    def __init__(self, context):
+        self.exact = {}
+        self.by_url = {}
+        self.served = {}
+        self.misses = []
+        self._load()
+        context.route("**/*", self._handle)
+
+    def _load(self):
+        directory = archive_dir()
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"No recorded archives in {directory}; run with NETWORK_MODE=record first.")
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".har"):
+                continue
+            with open(os.path.join(directory, name)) as f:
+                for entry in json.load(f)["log"]["entries"]:
+                    request = entry["request"]
+                    key = (request["method"], request["url"])
+                    self.exact.setdefault((*key, request["_bodyHash"]), []).append(entry["response"])
+                    self.by_url.setdefault(key, []).append(entry["response"])
+        logger.info(f"Loaded {len(self.exact)} recorded requests from {directory}.")
+
+    def _next(self, responses, key):
+        """
+        The next response recorded for the key, in recorded order; the last one once all were served.
+        """
+        index = self.served.get(key, 0)
+        self.served[key] = index + 1
+        return responses[min(index, len(responses) - 1)]
+
+    def _handle(self, route):
+        request = route.request
+        key = (request.method, request.url, body_hash(request.post_data_buffer))
+        if key in self.exact:
+            response = self._next(self.exact[key], key)
+        elif key[:2] in self.by_url:
+            response = self._next(self.by_url[key[:2]], key[:2])
+        else:
+            response = None
+        if response is None:
+            self.misses.append(f"{request.method} {request.url}")
+            route.abort()
+            return
+        route.fulfill(
+            status=response["status"],
+            headers={h["name"]: h["value"] for h in response["headers"] if h["name"].lower() not in SKIPPED_HEADERS},
+            body=base64.b64decode(response["content"]["text"]),
+        )
+
+    def report(self):
+        if self.misses:
+            logger.warning(f"{len(self.misses)} requests were not in the archive:")
+            for miss in self.misses:
+                logger.warning(f"  {miss}")
+        else:
+            logger.info("All requests were served from the archive.")
+
+
+def attach(context):
+    """
+    Attach a recorder or replayer to the context according to NETWORK_MODE. Returns it, or None when live.
+    """
+    mode = network_mode()
+    if mode == "record":
+        if os.getenv('PYTEST_XDIST_WORKER'):
+            raise RuntimeError("NETWORK_MODE=record cannot run under pytest-xdist; record without -n.")
+        return NetworkRecorder(context)
+    if mode == "replay":
+        return NetworkReplayer(context)
+    return None
+
+
+def finish(archive):
+    if isinstance(archive, NetworkRecorder):
+        archive.context.remove_listener("requestfinished", archive._on_request_finished)
+        archive.save()
+    elif isinstance(archive, NetworkReplayer):
+        archive.report()
@@ -0,0 +1,166 @@
+# product_dataset.py
+# External product datasets (CSV with a header row, or JSONL with one object per line) used as the
+# Examples rows of the scenario outlines instead of the table in the feature file. The file is
+# streamed row by row; only the sampled rows are kept, so a catalog of 100k entries costs no more
+# at collection than the rows a run uses.
+#
+# Each run takes Config.DATASET_PER_FAMILY rows of every product family (the "family" column, else
+# the product's family in the catalog). By default a cursor per family in Config.DATASET_CURSOR_FILE
+# moves on after every run, so consecutive runs cover the whole dataset and wrap around.
+# With DATASET_CURSOR=false the rows are a seeded, repeatable sample instead. Batch cart mode
+# (BAG_MODE=batch) has its own Examples and ignores the dataset.
+#
+# The cursor only resumes if its file survives between runs. On CI agents with a fresh workspace,
+# point DATASET_CURSOR_FILE at a persisted directory (azure-pipelines-playwright.yml keeps it in a
+# pipeline cache).
+#
+# Only list products whose add-to-bag flow adds that exact product: the remove step looks for the
+# product's name in the bag.
+#
+# PRODUCT_DATASET=data/products.csv DATASET_PER_FAMILY=2 pytest tests/test_parameter_apple_search_module.py
+
+import csv
+import hashlib
+import heapq
+import json
+import logging
+import os
+
+from config.config import Config
+from modules.catalog import load_catalog
+
+logger = logging.getLogger()
+
+_pending_cursor = None  # Cursor to save once the run is over
+
+
+def dataset_path():
+    return os.getenv('PRODUCT_DATASET')
+
+
+def dataset_applied():
+    """
+    True when the scenario outlines take their rows from the dataset.
+    """
+    return bool(dataset_path()) and os.getenv('BAG_MODE', 'single').lower() != 'batch'
+
+
+def cursor_file():
+    return os.getenv('DATASET_CURSOR_FILE', Config.DATASET_CURSOR_FILE)
+
+
+def cursor_enabled():
+    return os.getenv('DATASET_CURSOR', 'true').lower() == 'true'
+
+
+def per_family():
+    return int(os.getenv('DATASET_PER_FAMILY', Config.DATASET_PER_FAMILY))
+
+
+def stream_rows(path):
+    """
+    Yield the rows of a CSV or JSONL file as dicts of strings, one at a time.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line in f:
+                if line.strip():
+                    yield {key: str(value) for key, value in json.loads(line).items()}
+        else:
+            yield from csv.DictReader(f)
+
+
+def family_of(row):
+    if row.get("family"):
+        return row["family"]
+    product = load_catalog().find(row.get("product", ""))
+    return product.family if product is not None and product.family else "other"
+
+
+def _load_cursor():
+    try:
+        with open(cursor_file()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _from_cursor(path, count, cursor):
+    """
+    The next `count` rows of every family after its cursor, wrapping around at the end of the dataset.
+    Returns the rows and the cursor for the next run.
+    """
+    seen, taken, rows = {}, {}, []
+    for row in stream_rows(path):
+        family = family_of(row)
+        index = seen.get(family, 0)
+        seen[family] = index + 1
+        start = cursor.get(family, 0)
+        if start <= index < start + count:
+            rows.append(row)
+            taken[family] = taken.get(family, 0) + 1
+    # Families whose cursor ran past the end continue from their first rows
+    wrap = {family: min(count, total) - taken.get(family, 0) for family, total in seen.items()}
+    if any(missing > 0 for missing in wrap.values()):
+        wrapped = {}
+        for row in stream_rows(path):
+            family = family_of(row)
+            index = wrapped.get(family, 0)
+            wrapped[family] = index + 1
+            if index < wrap[family] and index < cursor.get(family, 0):
+                rows.append(row)
+                taken[family] = taken.get(family, 0) + 1
+    next_cursor = {family: (cursor.get(family, 0) + taken.get(family, 0)) % total
+                   for family, total in seen.items()}
+    return rows, next_cursor
+
+
+def _seeded_sample(path, count, seed):
+    """
+    `count` rows per family with the smallest seeded hash: repeatable and independent of row order.
+    """
+    heaps = {}
+    for position, row in enumerate(stream_rows(path)):
+        key = hashlib.sha1(f"{seed}|{json.dumps(row, sort_keys=True)}".encode()).hexdigest()
+        heap = heaps.setdefault(family_of(row), [])
+        # Max-heap on the hash (negated), so the largest of the kept rows is dropped first
+        entry = (-int(key[:15], 16), position, row)
+        if len(heap) < count:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+    return [row for heap in heaps.values() for _, _, row in sorted(heap, key=lambda entry: entry[1])]
+
+
+def sample_rows(path=None):
+    """
+    The dataset rows of this run, per Config.DATASET_PER_FAMILY and the cursor or seed.
+    """
+    global _pending_cursor
+    path = path or dataset_path()
+    count = per_family()
+    if cursor_enabled():
+        rows, _pending_cursor = _from_cursor(path, count, _load_cursor())
+    else:
+        rows = _seeded_sample(path, count, os.getenv('DATASET_SEED', Config.DATASET_SEED))
+    families = {family_of(row) for row in rows}
+    logger.info(f"Dataset {path}: {len(rows)} rows from {len(families)} families.")
+    return rows
+
+
+def save_cursor():
+    """
+    Move the cursors past this run's rows; called once the run is over. The pytest-xdist controller
+    does not collect, so it works the rows out again from the unchanged cursor file.
+    """
+    if not dataset_applied() or not cursor_enabled():
+        return
+    if _pending_cursor is None:
+        sample_rows()
+    path = cursor_file()
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_file = f"{path}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(_pending_cursor, f, indent=2, sort_keys=True)
+    os.replace(tmp_file, path)
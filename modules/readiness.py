@@ -0,0 +1,161 @@
+# readiness.py
+# Named, condition-based waits that replace the fixed page.wait_for_timeout sleeps.
+# Each wait records how long it really took, logs it against the old fixed budget,
+# and sizes its next timeout from the recorded history.
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+from config.config import Config
+
+logger = logging.getLogger()
+
+_latencies = None
+_lock = threading.Lock()
+
+
+def _load_latencies():
+    global _latencies
+    if _latencies is None:
+        _latencies = {}
+        if os.path.exists(Config.READINESS_LATENCY_FILE):
+            try:
+                with open(Config.READINESS_LATENCY_FILE) as f:
+                    _latencies = json.load(f)
+            except (OSError, ValueError):
+                logger.warning(f"Ignoring unreadable latency file {Config.READINESS_LATENCY_FILE}.")
+    return _latencies
+
+
+def _record_latency(name, duration_ms):
+    # The lock serializes the threads of a load run (modules/load_generator.py)
+    with _lock:
+        latencies = _load_latencies()
+        samples = latencies.setdefault(name, [])
+        samples.append(round(duration_ms, 1))
+        del samples[:-Config.READINESS_HISTORY_SIZE]
+        # Write to a temporary file first so parallel workers never read a half-written file
+        tmp_file = f"{Config.READINESS_LATENCY_FILE}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(latencies, f, indent=2)
+        os.replace(tmp_file, Config.READINESS_LATENCY_FILE)
+
+
+def timeout_for(name, default_ms=None):
+    """
+    Timeout for the named wait: the slowest recorded wait times READINESS_TIMEOUT_FACTOR,
+    kept between READINESS_MIN_TIMEOUT_MS and the default timeout.
+    """
+    default_ms = default_ms or Config.READINESS_DEFAULT_TIMEOUT_MS
+    samples = _load_latencies().get(name)
+    if not samples:
+        return default_ms
+    adaptive = max(samples) * Config.READINESS_TIMEOUT_FACTOR
+    return int(min(default_ms, max(Config.READINESS_MIN_TIMEOUT_MS, adaptive)))
+
+
+@contextmanager
+def timed_wait(name, fixed_budget_ms):
+    """
+    Time the wait in the block, record it and log it against the fixed sleep it replaces.
+    """
+    start = time.perf_counter()
+    yield timeout_for(name)
+    duration_ms = (time.perf_counter() - start) * 1000
+    _record_latency(name, duration_ms)
+    logger.info(f"Wait '{name}' took {duration_ms / 1000:.2f}s (fixed budget was {fixed_budget_ms / 1000:.2f}s).")
+
+
+@asynccontextmanager
+async def async_timed_wait(name, fixed_budget_ms):
+    """
+    timed_wait for async pages: the latency file is read and written in a worker thread so the
+    event loop keeps serving the other virtual users.
+    """
+    await asyncio.to_thread(_load_latencies)
+    start = time.perf_counter()
+    yield timeout_for(name)
+    duration_ms = (time.perf_counter() - start) * 1000
+    await asyncio.to_thread(_record_latency, name, duration_ms)
+    logger.info(f"Wait '{name}' took {duration_ms / 1000:.2f}s (fixed budget was {fixed_budget_ms / 1000:.2f}s).")
+
+
+def wait_for_actionable(locator, name, fixed_budget_ms):
+    """
+    Wait until the element is visible and can be clicked.
+    """
+    with timed_wait(name, fixed_budget_ms) as timeout:
+        locator.wait_for(state="visible", timeout=timeout)
+        locator.click(trial=True, timeout=timeout)
+
+
+def wait_for_url(page, name, url, fixed_budget_ms):
+    """
+    Wait until the page URL matches `url` (string, regex or predicate).
+    """
+    with timed_wait(name, fixed_budget_ms) as timeout:
+        page.wait_for_url(url, timeout=timeout)
+
+
+def wait_for_url_change(page, name, previous_url, fixed_budget_ms):
+    """
+    Wait until the page has navigated away from `previous_url`.
+    """
+    wait_for_url(page, name, lambda url: url != previous_url, fixed_budget_ms)
+
+
+def wait_for_bag_count(page, name, selector, expected_count, fixed_budget_ms):
+    """
+    Wait until the bag holds exactly `expected_count` elements matching `selector`.
+    """
+    with timed_wait(name, fixed_budget_ms) as timeout:
+        page.wait_for_function(
+            "([selector, count]) => document.querySelectorAll(selector).length === count",
+            arg=[selector, expected_count],
+            timeout=timeout,
+        )
+
+
+@contextmanager
+def wait_for_response(page, name, url_or_predicate, fixed_budget_ms):
+    """
+    Wait for a response matching `url_or_predicate` triggered by the actions in the block.
+
+    with wait_for_response(page, "bag_add", "**/shop/bag/add**", 5000):
+        page.get_by_role("button", name="Add to Bag").click()
+    """
+    with timed_wait(name, fixed_budget_ms) as timeout:
+        with page.expect_response(url_or_predicate, timeout=timeout) as response_info:
+            yield response_info
+
+
+# Versions of the waits above for playwright.async_api pages and locators
+
+
+async def async_wait_for_actionable(locator, name, fixed_budget_ms):
+    async with async_timed_wait(name, fixed_budget_ms) as timeout:
+        await locator.wait_for(state="visible", timeout=timeout)
+        await locator.click(trial=True, timeout=timeout)
+
+
+async def async_wait_for_url(page, name, url, fixed_budget_ms):
+    async with async_timed_wait(name, fixed_budget_ms) as timeout:
+        await page.wait_for_url(url, timeout=timeout)
+
+
+async def async_wait_for_url_change(page, name, previous_url, fixed_budget_ms):
+    await async_wait_for_url(page, name, lambda url: url != previous_url, fixed_budget_ms)
+
+
+async def async_wait_for_bag_count(page, name, selector, expected_count, fixed_budget_ms):
+    async with async_timed_wait(name, fixed_budget_ms) as timeout:
+        await page.wait_for_function(
+            "([selector, count]) => document.querySelectorAll(selector).length === count",
+            arg=[selector, expected_count],
+            timeout=timeout,
+        )
@@ -0,0 +1,132 @@
+# request_tracker.py
+# Tracks the requests of a page so a step can continue as soon as the requests it needs
+# have finished, instead of waiting for "networkidle" (apple.com rarely goes idle because
+# of analytics and media beacons).
+
+import fnmatch
+import logging
+import time
+
+from config.config import Config
+
+logger = logging.getLogger()
+
+
+class RequestTracker:
+    """
+    Attach to a page with RequestTracker(page), then call wait_for("<step>") in place of
+    page.wait_for_load_state("networkidle"). Patterns come from Config.CRITICAL_REQUESTS.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.document_start = time.perf_counter()
+        self.started = {}  # request -> start time
+        self.finished = []  # (url, start time, end time)
+        self.events = []  # (time, +1 for start / -1 for end), used to estimate networkidle
+        self.steps = []  # (step, wait start, ready time) of the current document
+        self.results = []  # (step, wait start, ready time, estimated networkidle time or None, end of estimate)
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+
+    def detach(self):
+        """
+        Stop tracking; used when the page outlives the tracker (load runs reuse pages across journeys).
+        """
+        self.page.remove_listener("request", self._on_request)
+        self.page.remove_listener("requestfinished", self._on_request_done)
+        self.page.remove_listener("requestfailed", self._on_request_done)
+
+    def _on_request(self, request):
+        now = time.perf_counter()
+        if request.is_navigation_request() and request.frame == self.page.main_frame:
+            # A new document: requests of the previous one no longer count, so settle its steps
+            # and drop its history instead of keeping every request of the session
+            self._settle_steps(now)
+            self.document_start = now
+            self.finished = []
+            self.events = [(now, sum(delta for _, delta in self.events))]
+        self.started[request] = now
+        self.events.append((now, 1))
+
+    def _on_request_done(self, request):
+        now = time.perf_counter()
+        start = self.started.pop(request, None)
+        if start is None:
+            return
+        self.finished.append((request.url, start, now))
+        self.events.append((now, -1))
+
+    def _is_ready(self, patterns):
+        for pattern in patterns:
+            if any(fnmatch.fnmatch(request.url, pattern) for request in self.started):
+                return False
+            if not any(start >= self.document_start and fnmatch.fnmatch(url, pattern)
+                       for url, start, _ in self.finished):
+                return False
+        return True
+
+    def wait_for(self, step, patterns=None, timeout=None):
+        """
+        Wait until every critical request pattern of `step` has finished on the current document.
+        """
+        patterns = patterns if patterns is not None else Config.CRITICAL_REQUESTS[step]
+        timeout = timeout or Config.CRITICAL_REQUEST_TIMEOUT_MS
+        start = time.perf_counter()
+        deadline = start + timeout / 1000
+        while not self._is_ready(patterns):
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"Critical requests {patterns} for step '{step}' did not finish in {timeout}ms.")
+            # Short waits keep Playwright dispatching request events to the listeners above
+            self.page.wait_for_timeout(Config.CRITICAL_REQUEST_POLL_MS)
+        ready = time.perf_counter()
+        self.steps.append((step, start, ready))
+        logger.info(f"Critical requests for '{step}' finished in {ready - start:.2f}s.")
+
+    def _networkidle_time(self, start, end):
+        """
+        Estimate when "networkidle" (no requests in flight for NETWORKIDLE_QUIET_MS) would have
+        resolved after `start`. Returns None if the network did not go idle before `end`.
+        """
+        quiet = Config.NETWORKIDLE_QUIET_MS / 1000
+        in_flight = sum(delta for t, delta in self.events if t < start)
+        idle_since = start if in_flight <= 0 else None
+        for t, delta in sorted(e for e in self.events if e[0] >= start):
+            if idle_since is not None and t - idle_since >= quiet:
+                return idle_since + quiet
+            in_flight += delta
+            idle_since = t if in_flight <= 0 else None
+        if idle_since is not None and end - idle_since >= quiet:
+            return idle_since + quiet
+        return None
+
+    def _settle_steps(self, end):
+        """
+        Estimate networkidle for the steps of the current document, using its requests up to `end`.
+        """
+        for step, start, ready in self.steps:
+            self.results.append((step, start, ready, self._networkidle_time(start, end), end))
+        self.steps = []
+
+    def report(self):
+        """
+        Log, per step, the time saved compared with waiting for "networkidle". A networkidle wait
+        would have timed out after Config.CRITICAL_REQUEST_TIMEOUT_MS, which caps the saving.
+        """
+        self._settle_steps(time.perf_counter())
+        timeout = Config.CRITICAL_REQUEST_TIMEOUT_MS / 1000
+        total_saved = 0.0
+        for step, start, ready, idle, end in self.results:
+            cap = max(start + timeout - ready, 0.0)
+            if idle is None:
+                saved = min(end - ready, cap)
+                logger.info(f"Step '{step}': ready after {ready - start:.2f}s, network never went idle "
+                            f"(saved at least {saved:.2f}s).")
+            else:
+                saved = min(max(idle - ready, 0.0), cap)
+                logger.info(f"Step '{step}': ready after {ready - start:.2f}s, networkidle after "
+                            f"{idle - start:.2f}s (saved {saved:.2f}s).")
+            total_saved += saved
+        logger.info(f"Critical-request waits saved {total_saved:.2f}s compared with networkidle.")
+        return total_saved
@@ -0,0 +1,104 @@
+# resource_policy.py
+# Route interception that blocks resource types and tracker domains per step, so steps that only
+# click through the DOM do not download the full apple.com media stack. Reports requests and bytes
+# avoided per scenario.
+
+import fnmatch
+import logging
+import os
+from urllib.parse import urlparse
+
+from config.config import Config
+
+logger = logging.getLogger()
+
+_current_step = None
+
+
+def blocking_enabled():
+    return os.getenv('RESOURCE_BLOCKING', 'true').lower() == 'true'
+
+
+def set_step(step_name):
+    """
+    Called before each step (see pytest_bdd_before_step in conftest.py) to switch the active policy.
+    """
+    global _current_step
+    _current_step = step_name
+
+
+def current_policy():
+    return Config.STEP_RESOURCE_POLICY.get(_current_step, "full")
+
+
+class ResourcePolicy:
+    """
+    Blocks requests on a context according to the policy of the current step.
+    Requests that are not blocked fall through to other route handlers (e.g. network replay).
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self.known_sizes = {}  # URL -> body size seen when it was not blocked
+        self.blocked = []
+        context.route("**/*", self._handle)
+        context.on("requestfinished", self._on_request_finished)
+
+    def _is_blocked(self, request):
+        host = urlparse(request.url).hostname or ""
+        if any(fnmatch.fnmatch(host, pattern) for pattern in Config.BLOCKED_DOMAINS):
+            return True
+        return request.resource_type in Config.RESOURCE_POLICIES[current_policy()]
+
+    def _handle(self, route):
+        if self._is_blocked(route.request):
+            self.blocked.append(route.request.url)
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    def _on_request_finished(self, request):
+        try:
+            self.known_sizes[request.url] = request.sizes()["responseBodySize"]
+        except Exception:
+            pass
+
+    def report(self, scenario_name):
+        """
+        Log what the policy avoided for a scenario and start counting afresh.
+        Byte counts are only known for URLs that were downloaded at some point in the session.
+        """
+        avoided_bytes = sum(self.known_sizes.get(url, 0) for url in self.blocked)
+        unknown = sum(1 for url in self.blocked if url not in self.known_sizes)
+        logger.info(f"Scenario '{scenario_name}': blocked {len(self.blocked)} requests, "
+                    f"avoided at least {avoided_bytes / 1024:.0f} KiB ({unknown} of unknown size).")
+        self.blocked = []
+        return avoided_bytes
+
+
+_policies = []
+
+
+def attach(context):
+    """
+    Attach a ResourcePolicy to the context unless RESOURCE_BLOCKING=false. Returns it, or None.
+    """
+    if not blocking_enabled():
+        return None
+    policy = ResourcePolicy(context)
+    _policies.append(policy)
+    return policy
+
+
+def detach(policy):
+    """
+    Stop counting the context's requests; its route is dropped when the context is closed or reset.
+    """
+    if policy in _policies:
+        _policies.remove(policy)
+        policy.context.remove_listener("requestfinished", policy._on_request_finished)
+
+
+def report_scenario(scenario_name):
+    for policy in _policies:
+        policy.report(scenario_name)
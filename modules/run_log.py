@@ -0,0 +1,119 @@
+# run_log.py
+# Queue-based logging: log calls only put records on a queue, a listener thread does the I/O.
+# Every process writes JSONL events to logs/run_<worker>.jsonl, so pytest-xdist workers never
+# share a file; merge_worker_logs() combines them into one ordered logs/run.jsonl at session end.
+
+import glob
+import heapq
+import json
+import logging
+import logging.handlers
+import os
+import queue
+
+from config.config import Config
+
+logger = logging.getLogger()
+
+# Structured fields that can be passed with extra={...} and end up in the JSONL events
+EVENT_FIELDS = ("scenario", "product", "step", "duration", "url", "status")
+
+_listener = None
+_queue_handler = None
+
+
+def worker_id():
+    return os.getenv('PYTEST_XDIST_WORKER', 'main')
+
+
+def is_worker():
+    return 'PYTEST_XDIST_WORKER' in os.environ
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        event = {"time": record.created, "worker": worker_id(), "level": record.levelname,
+                 "message": record.getMessage()}
+        for field in EVENT_FIELDS:
+            if hasattr(record, field):
+                event[field] = getattr(record, field)
+        return json.dumps(event)
+
+
+def setup_logging(level=logging.INFO):
+    """
+    Route the root logger through a queue. Safe to call more than once.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+    os.makedirs(Config.LOG_DIR, exist_ok=True)
+    readable = logging.Formatter("%(asctime)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(readable)
+    jsonl_handler = logging.FileHandler(os.path.join(Config.LOG_DIR, f"run_{worker_id()}.jsonl"), mode='w')
+    jsonl_handler.setFormatter(JsonFormatter())
+    handlers = [stream_handler, jsonl_handler]
+    if not is_worker():
+        file_handler = logging.FileHandler(Config.LOG_FILE, mode='w')
+        file_handler.setFormatter(readable)
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    logger.addHandler(_queue_handler)
+    logger.setLevel(level)
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging():
+    """
+    Flush the queue, close the files and take the queue handler off the root logger, so later
+    records are not queued with no listener to write them.
+    """
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    logger.removeHandler(_queue_handler)
+    _queue_handler = None
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+def log_step(step, duration, scenario=None, product=None, url=None, status="passed"):
+    logger.info(f"Step '{step}' {status} in {duration:.2f}s",
+                extra={"scenario": scenario, "product": product, "step": step,
+                       "duration": round(duration, 3), "url": url, "status": status})
+
+
+def clear_worker_logs():
+    # Files left by a previous run with more workers would otherwise be merged into this run
+    for path in glob.glob(os.path.join(Config.LOG_DIR, "run_*.jsonl")):
+        os.remove(path)
+
+
+def _read_events(path):
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def merge_worker_logs():
+    """
+    Merge the per-worker JSONL files (each already in time order) into logs/run.jsonl.
+    """
+    paths = sorted(glob.glob(os.path.join(Config.LOG_DIR, "run_*.jsonl")))
+    merged_path = os.path.join(Config.LOG_DIR, "run.jsonl")
+    count = 0
+    with open(merged_path, 'w') as f:
+        for event in heapq.merge(*(_read_events(path) for path in paths), key=lambda e: e["time"]):
+            f.write(json.dumps(event) + "\n")
+            count += 1
+    return merged_path, count
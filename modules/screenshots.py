@@ -0,0 +1,142 @@
+# screenshots.py
+# Screenshot pipeline: the step only waits for the browser to hand over the image bytes;
+# writing them into screenshots/ happens on a background thread pool while the test continues.
+# Call flush() (done in pytest_sessionfinish in conftest.py) to wait for pending writes.
+#
+# Playwright encodes the image inside the browser, so the encoding cost is controlled with the
+# format, quality and clip options rather than moved to a thread.
+
+import atexit
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config.config import Config
+
+logger = logging.getLogger()
+
+_executor = ThreadPoolExecutor(max_workers=Config.SCREENSHOT_WORKERS, thread_name_prefix="screenshots")
+_pending = []
+_taken = []  # Paths queued since the last call to taken(), recorded once thumbnails are enabled
+_lock = threading.Lock()
+_thumbnails = False
+
+
+def screenshot_format():
+    return os.getenv('SCREENSHOT_FORMAT', Config.SCREENSHOT_FORMAT).lower()
+
+
+def _path_for(path, fmt):
+    root, _ = os.path.splitext(path)
+    return f"{root}.{'jpg' if fmt == 'jpeg' else 'png'}"
+
+
+def thumbnail_path(path):
+    directory, name = os.path.split(path)
+    return os.path.join(directory, Config.THUMBNAIL_DIR, f"{os.path.splitext(name)[0]}.jpg")
+
+
+def enable_thumbnails():
+    """
+    Also write a small JPEG of every screenshot to thumbnail_path(), for reports that link screenshots.
+    """
+    global _thumbnails
+    _thumbnails = True
+
+
+def _write_thumbnail(path, data):
+    from PIL import Image
+
+    thumb_path = thumbnail_path(path)
+    os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
+    with Image.open(io.BytesIO(data)) as image:
+        image.thumbnail((Config.THUMBNAIL_WIDTH, Config.THUMBNAIL_WIDTH * 4))
+        image.convert("RGB").save(thumb_path, "JPEG", quality=70)
+
+
+def _write(path, data):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    if _thumbnails:
+        _write_thumbnail(path, data)
+    return path
+
+
+def _options(box, full_page):
+    fmt = screenshot_format()
+    options = {"type": fmt}
+    if fmt == "jpeg":
+        options["quality"] = Config.SCREENSHOT_QUALITY
+    if box:
+        options["clip"] = box
+    elif full_page:
+        options["full_page"] = True
+    return options
+
+
+def save(name, data):
+    """
+    Queue `data` (image bytes in the configured format) to be written to Config.SCREENSHOT_DIR/`name`.
+    A `name` that already starts with Config.SCREENSHOT_DIR (the old capture(page, 'screenshots/x.png')
+    form) is written there too, not to a nested screenshots/screenshots/. Returns the path that will be written.
+    """
+    prefix = os.path.normpath(Config.SCREENSHOT_DIR) + os.sep
+    if os.path.normpath(name).startswith(prefix):
+        name = os.path.normpath(name)[len(prefix):]
+    path = _path_for(os.path.join(Config.SCREENSHOT_DIR, name), screenshot_format())
+    future = _executor.submit(_write, path, data)
+    with _lock:
+        # Written screenshots are dropped so long load runs do not accumulate futures
+        _pending[:] = [pending for pending in _pending if not pending.done() or pending.exception()]
+        _pending.append(future)
+        if _thumbnails:
+            _taken.append(path)
+    return path
+
+
+def taken():
+    """
+    Paths of the screenshots queued since the previous call.
+    """
+    with _lock:
+        paths, _taken[:] = list(_taken), []
+    return paths
+
+
+def capture(page, name, element=None, full_page=False):
+    """
+    Take a screenshot of the page (or only of `element`, a locator) and write it to
+    Config.SCREENSHOT_DIR/`name` in the background. The extension of `name` follows the configured
+    format. Returns the path that will be written.
+    """
+    box = element.bounding_box() if element is not None else None
+    return save(name, page.screenshot(**_options(box, full_page)))
+
+
+async def async_capture(page, name, element=None, full_page=False):
+    """
+    capture() for playwright.async_api pages.
+    """
+    box = await element.bounding_box() if element is not None else None
+    return save(name, await page.screenshot(**_options(box, full_page)))
+
+
+def flush():
+    """
+    Wait until every queued screenshot is on disk; failed writes are logged.
+    """
+    with _lock:
+        futures, _pending[:] = list(_pending), []
+    for future in futures:
+        try:
+            future.result()
+        except OSError as e:
+            logger.error(f"Could not write screenshot: {e}")
+
+
+atexit.register(flush)
@@ -0,0 +1,97 @@
+# search_flow.py
+# The steps of the search, add-to-bag, review and remove flow as plain functions taking the page and
+# its RequestTracker. The BDD steps in tests/test_parameter_apple_search_module.py call them, and so
+# do the step benchmarks and the load generator. Those run outside a pytest-bdd collection, so they
+# cannot import the test module: its scenarios() call needs pytest's configuration.
+
+import logging
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from config.config import Config
+from modules import warm_start
+from modules.catalog import load_catalog
+from modules.readiness import wait_for_bag_count, wait_for_url, wait_for_url_change
+from modules.remove_product_from_bag import handle_remove_product
+from modules.screenshots import capture
+
+logger = logging.getLogger()
+
+BAG_ITEM_SELECTOR = '[data-autom="bag-item-remove-button"]'
+
+
+def file_name(product):
+    return product.replace('"', '').replace("'", "").replace(" ", "_")
+
+
+def visit_apple_com(page, request_tracker):
+    page.goto(Config.HOMEPAGE_URL, wait_until="domcontentloaded")
+    request_tracker.wait_for("homepage")
+    warm_start.snapshot(page)
+    capture(page, 'homepage.png')
+    logger.info("Visited Apple homepage")
+
+
+def search_for_product(page, request_tracker, product):
+    logger.info(f"Searching for {product}")
+    request_tracker.wait_for("search_ready")
+
+    search_button = page.get_by_role("button", name="Search apple.com")
+    search_button.click()
+    search_input = page.get_by_placeholder("Search apple.com")
+    search_input.fill(product)
+    search_input.press("Enter")
+
+    # Wait for search results to load
+    page.wait_for_selector('text="Search Results"', timeout=10000)
+    request_tracker.wait_for("search_results")
+
+    # Take a screenshot after performing the search
+    capture(page, f'search_results_for_{file_name(product)}.png')
+
+    # Navigate to the product page based on search results
+    product_name = load_catalog().get(product).search_link
+
+    # Click the product link and wait for the product page instead of a fixed sleep
+    search_url = page.url
+    page.get_by_role("link", name=product_name, exact=True).click()
+    wait_for_url_change(page, "product_page_opened", search_url, fixed_budget_ms=5000)
+
+
+def add_product_to_bag(page, product):
+    load_catalog().get(product).add_to_bag(page)  # Run the product's add-to-bag flow from the catalog
+
+
+def proceed_to_review_bag(page, request_tracker):
+    logger.info("Proceeding to review bag.")
+    review_bag_button = page.get_by_role("button", name="Review Bag")
+    review_bag_button.wait_for(state="visible", timeout=5000)
+    review_bag_button.click()
+    request_tracker.wait_for("review_bag")
+
+
+def take_screenshot_of_review(page, request_tracker, product):
+    request_tracker.wait_for("bag_screenshot")
+    screenshot_path = capture(page, f'reviewed_{file_name(product)}.png')
+    logger.info(f"Screenshot of the reviewed {product} taken at {screenshot_path}.")
+
+
+def remove_product_from_bag(page, product):
+    items_before = page.locator(BAG_ITEM_SELECTOR).count()
+    handle_remove_product(page, product)  # Pass the product name dynamically
+    wait_for_bag_count(page, "bag_item_removed", BAG_ITEM_SELECTOR, max(items_before - 1, 0), fixed_budget_ms=2000)
+
+
+def return_to_homepage(page, request_tracker):
+    request_tracker.wait_for("homepage_return")
+    try:
+        # Wait for the Apple home page button to be clickable
+        apple_home_page = page.wait_for_selector("a.globalnav-link-apple", state='visible', timeout=20000)
+        # Click the Apple home page button
+        apple_home_page.click()
+        wait_for_url(page, "homepage_returned", Config.HOMEPAGE_URL, fixed_budget_ms=2000)
+        page.wait_for_load_state('load')  # Wait for the page to fully load
+    except PlaywrightTimeoutError:
+        # If the link is not clickable, fallback to direct navigation
+        page.goto(Config.HOMEPAGE_URL)
+        page.wait_for_load_state('load')  # Wait for the homepage to load
@@ -0,0 +1,67 @@
+# shard_planner.py
+# Splits the collected tests into n shards of about equal expected time (longest-processing-time
+# bin packing on the durations recorded by durations.py) for `pytest --shard i/n`.
+# In sequential mode the scenarios of a feature share one page, so each test file is kept whole;
+# in parallel mode (PARALLEL=true) every Examples row and scenario is placed on its own.
+
+import heapq
+import os
+
+from modules.durations import estimate_item
+
+
+def parse_shard(value):
+    """
+    "2/4" -> (2, 4); shards are numbered from 1.
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"--shard expects i/n, got '{value}'.")
+    if not 1 <= index <= count:
+        raise ValueError(f"--shard {value}: i must be between 1 and n.")
+    return index, count
+
+
+def _units(items):
+    if os.getenv('PARALLEL', 'false').lower() == 'true':
+        return [[item] for item in items]
+    by_file = {}
+    for item in items:
+        by_file.setdefault(item.nodeid.split("::")[0], []).append(item)
+    return list(by_file.values())
+
+
+def plan(items, count):
+    """
+    Returns `count` shards as (expected seconds, [items]), items kept in collection order.
+    """
+    units = sorted(_units(items), key=lambda unit: (-sum(estimate_item(item) for item in unit), unit[0].nodeid))
+    heap = [(0.0, index) for index in range(count)]
+    shards = [[0.0, []] for _ in range(count)]
+    for unit in units:
+        seconds, index = heapq.heappop(heap)
+        seconds += sum(estimate_item(item) for item in unit)
+        shards[index][0] = seconds
+        shards[index][1].extend(unit)
+        heapq.heappush(heap, (seconds, index))
+    order = {item.nodeid: position for position, item in enumerate(items)}
+    return [(seconds, sorted(shard_items, key=lambda item: order[item.nodeid])) for seconds, shard_items in shards]
+
+
+def summary(shards, index, prefiltered, split_rows):
+    """
+    (test count, expected seconds) per shard, including the Examples row tests split before expansion
+    (feature_cache.py). Only this shard's (`index`) prefiltered tests were collected; the other shards'
+    are estimated from their share of the split rows (`split_rows`, rows per shard).
+    """
+    seconds_per_test = sum(estimate_item(item) for item in prefiltered) / len(prefiltered) if prefiltered else 0.0
+    tests_per_row = len(prefiltered) / split_rows[index - 1] if split_rows and split_rows[index - 1] else 0.0
+    result = []
+    for number, (seconds, shard_items) in enumerate(shards, start=1):
+        if number == index:
+            extra = len(prefiltered)
+        else:
+            extra = round(split_rows[number - 1] * tests_per_row) if split_rows else 0
+        result.append((len(shard_items) + extra, seconds + extra * seconds_per_test))
+    return result
@@ -0,0 +1,101 @@
+# storefront.py
+# Local stand-in for apple.com serving the pages in storefront/ with the same paths, labels and
+# buttons the BDD steps use, so benchmarks and load runs do not depend on the real site.
+#
+# python -m modules.storefront 8000   -> serve on http://127.0.0.1:8000/
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from config.config import Config
+
+logger = logging.getLogger()
+
+# Path prefix -> page served for it; the first match wins
+ROUTES = [
+    ("/us/search/", "search.html"),
+    ("/macbook-pro/", "macbook-pro.html"),
+    ("/iphone-16-pro/", "iphone-16-pro.html"),
+    ("/shop/buy-mac/", "buy-mac.html"),
+    ("/shop/buy-iphone/", "buy-iphone.html"),
+    ("/shop/bag", "bag.html"),
+]
+
+
+class StorefrontHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=Config.STOREFRONT_DIR, **kwargs)
+
+    def translate_path(self, path):
+        route = path.split("?", 1)[0]
+        for prefix, page in ROUTES:
+            if route.startswith(prefix):
+                return os.path.join(os.path.abspath(Config.STOREFRONT_DIR), page)
+        return super().translate_path(path)
+
+    def _delay(self):
+        if Config.STOREFRONT_LATENCY_MS:
+            time.sleep(Config.STOREFRONT_LATENCY_MS / 1000)
+
+    def do_GET(self):
+        self._delay()
+        super().do_GET()
+
+    def do_POST(self):
+        # Bag add/remove calls: the bag itself lives in the page's localStorage
+        self._delay()
+        item = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8")
+        body = json.dumps({"status": "ok", "item": item}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Storefront:
+    """
+    Serve the storefront on a background thread; use as a context manager.
+
+    with Storefront() as url:
+        page.goto(url)
+    """
+
+    def __init__(self, port=0):
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), StorefrontHandler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        logger.info(f"Stand-in storefront serving on {self.url}")
+        return self.url
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    storefront = Storefront(int(sys.argv[1]) if len(sys.argv) > 1 else 8000)
+    storefront.start()
+    try:
+        storefront.thread.join()
+    except KeyboardInterrupt:
+        storefront.stop()
@@ -0,0 +1,133 @@
+# stream_report.py
+# Streaming HTML report: every result is appended to disk as soon as the test finishes, so memory
+# stays flat however many Examples rows run. Results go to numbered pages of
+# Config.STREAM_REPORT_PAGE_SIZE rows; screenshots are linked through thumbnails instead of being
+# inlined; failures are also appended to failures.html; index.html summarizes the run per page.
+# results.jsonl holds the same results for other tools. Attempts retried by pytest-rerunfailures
+# (outcome "rerun") are listed and counted as reruns.
+#
+# pytest --stream-report report -o addopts="-v -s"   -> report/index.html instead of reportbdd.html
+
+import html
+import json
+import os
+import time
+
+from config.config import Config
+from modules.screenshots import thumbnail_path
+
+PAGE_STYLE = ("<style>body{font-family:sans-serif}table{border-collapse:collapse}td,th{border:1px solid #ccc;"
+              "padding:4px;vertical-align:top}.passed{color:#080}.failed{color:#c00}.skipped{color:#888}.rerun{color:#c60}"
+              "pre{max-height:20em;overflow:auto;white-space:pre-wrap}</style>")
+MAX_FAILURE_TEXT = 20000  # Characters of a failure's traceback written to the report
+
+
+def _open_html(path, title):
+    f = open(path, 'w', encoding="utf-8")
+    f.write(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title>"
+            f"{PAGE_STYLE}</head><body><h1>{html.escape(title)}</h1><p><a href='index.html'>Summary</a></p>\n")
+    return f
+
+
+class StreamReport:
+    """
+    StreamReport(directory).add(report) per test report, close() at the end of the session.
+    Only the per-page counters are kept in memory.
+    """
+
+    def __init__(self, directory, page_size=None):
+        self.directory = directory
+        self.page_size = page_size or Config.STREAM_REPORT_PAGE_SIZE
+        self.pages = []  # {"file", "first", "count", "passed", "failed", "skipped", "rerun"}
+        self.totals = {"passed": 0, "failed": 0, "skipped": 0, "rerun": 0}
+        self.started = time.time()
+        self.page = None
+        os.makedirs(directory, exist_ok=True)
+        self.results = open(os.path.join(directory, "results.jsonl"), 'w', encoding="utf-8")
+        self.failures = _open_html(os.path.join(directory, "failures.html"), "Failures")
+
+    def _link(self, path):
+        return html.escape(os.path.relpath(path, self.directory).replace(os.sep, "/"), quote=True)
+
+    def _screenshots_html(self, paths):
+        return "".join(f"<a href='{self._link(path)}'><img src='{self._link(thumbnail_path(path))}' "
+                       f"alt='{html.escape(os.path.basename(path), quote=True)}' loading='lazy'></a> "
+                       for path in paths)
+
+    def _page_file(self):
+        if self.page is not None and self.pages[-1]["count"] < self.page_size:
+            return self.page
+        if self.page is not None:
+            self._close_page()
+        number = len(self.pages) + 1
+        name = f"page_{number:04d}.html"
+        self.pages.append({"file": name, "first": sum(page["count"] for page in self.pages) + 1, "count": 0,
+                           "passed": 0, "failed": 0, "skipped": 0, "rerun": 0})
+        self.page = _open_html(os.path.join(self.directory, name), f"Results, page {number}")
+        self.page.write("<table><tr><th>#</th><th>Result</th><th>Test</th><th>Duration</th>"
+                        "<th>Screenshots</th></tr>\n")
+        return self.page
+
+    def _close_page(self):
+        self.page.write("</table></body></html>\n")
+        self.page.close()
+        self.page = None
+
+    def add(self, report, screenshots=()):
+        """
+        Append the result of a test: its call report, or a setup/teardown report that did not pass.
+        """
+        if report.when != "call" and report.passed:
+            return
+        outcome = report.outcome
+        page_file = self._page_file()
+        page = self.pages[-1]
+        number = page["first"] + page["count"]
+        page["count"] += 1
+        page[outcome] += 1
+        self.totals[outcome] += 1
+
+        anchor = f"r{number}"
+        name = report.nodeid if report.when == "call" else f"{report.nodeid} ({report.when})"
+        row = (f"<tr id='{anchor}'><td>{number}</td><td class='{outcome}'>{outcome}</td>"
+               f"<td>{html.escape(name)}</td><td>{report.duration:.2f}s</td>"
+               f"<td>{self._screenshots_html(screenshots)}</td></tr>\n")
+        page_file.write(row)
+        if report.failed or outcome == "rerun":
+            text = report.longreprtext[:MAX_FAILURE_TEXT]
+            page_file.write(f"<tr><td colspan='5'><pre>{html.escape(text)}</pre></td></tr>\n")
+        if report.failed:
+            self.failures.write(f"<p><a href='{page['file']}#{anchor}'>{html.escape(name)}</a></p>"
+                                f"<pre>{html.escape(text)}</pre>\n")
+        page_file.flush()
+        self.results.write(json.dumps({"number": number, "nodeid": report.nodeid, "when": report.when,
+                                       "outcome": outcome, "duration": round(report.duration, 3),
+                                       "screenshots": list(screenshots)}) + "\n")
+        self.results.flush()
+
+    def close(self):
+        if self.page is not None:
+            self._close_page()
+        self.failures.write("</body></html>\n")
+        self.failures.close()
+        self.results.close()
+        self._write_index()
+
+    def _write_index(self):
+        total = sum(self.totals.values())
+        elapsed = time.time() - self.started
+        tmp_file = os.path.join(self.directory, "index.html.tmp")
+        with _open_html(tmp_file, "Test run summary") as f:
+            f.write(f"<p>{total} results in {elapsed:.0f}s: "
+                    + ", ".join(f"<span class='{outcome}'>{count} {outcome}</span>"
+                                for outcome, count in self.totals.items())
+                    + (" (<a href='failures.html'>failures</a>)" if self.totals["failed"] else "") + "</p>\n")
+            f.write("<table><tr><th>Page</th><th>Results</th><th>Passed</th><th>Failed</th><th>Skipped</th>"
+                    "<th>Reruns</th></tr>\n")
+            for number, page in enumerate(self.pages, start=1):
+                last = page["first"] + page["count"] - 1
+                f.write(f"<tr><td><a href='{page['file']}'>Page {number}</a></td><td>{page['first']}-{last}</td>"
+                        f"<td>{page['passed']}</td><td class='{'failed' if page['failed'] else ''}'>"
+                        f"{page['failed']}</td><td>{page['skipped']}</td><td>{page['rerun']}</td></tr>\n")
+            f.write("</table></body></html>\n")
+        os.replace(tmp_file, os.path.join(self.directory, "index.html"))
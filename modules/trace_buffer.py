@@ -0,0 +1,99 @@
+# trace_buffer.py
+# Always-on Playwright tracing with a bounded ring buffer. Every context traces (screenshots and DOM
+# snapshots) in one chunk per step; the chunks of the last Config.TRACE_BUFFER_STEPS steps are kept
+# in memory and dropped as new steps finish. When a step fails, the buffered chunks and the failing
+# one are written to Config.TRACE_DIR as one compressed zip; open each chunk inside with
+# `playwright show-trace <chunk>.zip`. The time spent in tracing calls is reported per run.
+
+import logging
+import os
+import re
+import tempfile
+import time
+import weakref
+import zipfile
+from collections import deque
+
+from config.config import Config
+
+logger = logging.getLogger()
+
+_buffers = weakref.WeakKeyDictionary()  # context -> deque of (step name, chunk bytes)
+_open_chunks = weakref.WeakSet()  # Contexts with a chunk started and not stopped yet
+_overhead = {"seconds": 0.0, "steps": 0, "bytes": 0, "traces": 0}
+
+
+def tracing_enabled():
+    return os.getenv('TRACING', 'true').lower() == 'true'
+
+
+def _stop_chunk(context):
+    """
+    Stop the running chunk and return its bytes.
+    """
+    fd, path = tempfile.mkstemp(suffix=".zip")
+    os.close(fd)
+    try:
+        context.tracing.stop_chunk(path=path)
+        with open(path, 'rb') as f:
+            return f.read()
+    finally:
+        os.remove(path)
+
+
+def start_step(page):
+    if not tracing_enabled() or page is None:
+        return
+    start = time.perf_counter()
+    context = page.context
+    if context not in _buffers:
+        context.tracing.start(screenshots=True, snapshots=True)
+        _buffers[context] = deque(maxlen=Config.TRACE_BUFFER_STEPS)
+    context.tracing.start_chunk()
+    _open_chunks.add(context)
+    _overhead["seconds"] += time.perf_counter() - start
+
+
+def finish_step(page, step_name, failed=False, scenario_name=""):
+    """
+    Buffer the step's chunk; on failure write the buffer to disk and return the trace path.
+    """
+    if page is None or page.context not in _open_chunks:
+        return None
+    start = time.perf_counter()
+    context = page.context
+    _open_chunks.discard(context)
+    buffer = _buffers[context]
+    try:
+        chunk = _stop_chunk(context)
+    except Exception as e:
+        logger.warning(f"Could not stop the trace chunk of '{step_name}': {e}")
+        return None
+    buffer.append((step_name, chunk))
+    _overhead["steps"] += 1
+    _overhead["bytes"] += len(chunk)
+    path = _write(buffer, scenario_name, step_name) if failed else None
+    _overhead["seconds"] += time.perf_counter() - start
+    return path
+
+
+def _write(buffer, scenario_name, step_name):
+    os.makedirs(Config.TRACE_DIR, exist_ok=True)
+    slug = re.sub(r"[^0-9A-Za-z]+", "_", f"{scenario_name}_{step_name}").strip("_")
+    path = os.path.join(Config.TRACE_DIR, f"{slug}_{time.strftime('%Y%m%d_%H%M%S')}.zip")
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for number, (name, chunk) in enumerate(buffer, start=1):
+            archive.writestr(f"{number:02d}_{re.sub(r'[^0-9A-Za-z]+', '_', name).strip('_')}.zip", chunk)
+    buffer.clear()
+    _overhead["traces"] += 1
+    logger.info(f"Step '{step_name}' failed, trace of the last steps written to {path}.")
+    return path
+
+
+def report():
+    if not _overhead["steps"]:
+        return
+    logger.info(f"Tracing overhead: {_overhead['seconds']:.2f}s over {_overhead['steps']} steps "
+                f"({_overhead['seconds'] / _overhead['steps'] * 1000:.0f}ms per step, "
+                f"{_overhead['bytes'] / _overhead['steps'] / 1024:.0f}KB per chunk), "
+                f"{_overhead['traces']} traces written.")
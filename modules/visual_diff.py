@@ -0,0 +1,132 @@
+# visual_diff.py
+# Compare screenshots against stored baselines with vectorized tile diffs.
+# Identical images and unchanged tiles are skipped early; for changed images a compact
+# one-bit-per-tile diff mask is written to Config.DIFF_DIR. Dynamic regions (prices, banners)
+# listed in Config.VISUAL_DIFF_MASKS are ignored. An image regresses when too many tiles changed, or
+# when its average hash moved by more than Config.VISUAL_DIFF_MAX_HASH_DISTANCE bits (a layout shift
+# spread thinly over the page can stay under the tile tolerance).
+#
+# python -m modules.visual_diff            -> compare screenshots/ with the baselines
+# python -m modules.visual_diff --update   -> store the current screenshots as baselines
+
+import argparse
+import logging
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from config.config import Config
+
+logger = logging.getLogger()
+
+IMAGE_EXTENSIONS = (".png", ".jpg")
+
+
+def load(path):
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGB"), dtype=np.int16)
+
+
+def average_hash(pixels, size=8):
+    """
+    64-bit perceptual hash: each bit tells whether a cell of an 8x8 grayscale grid is above the mean.
+    """
+    gray = pixels.mean(axis=2)
+    h, w = gray.shape
+    cells = gray[:h - h % size, :w - w % size].reshape(size, (h - h % size) // size, size, -1).mean(axis=(1, 3))
+    return np.packbits(cells > cells.mean()).tobytes()
+
+
+def hash_distance(a, b):
+    return int(np.unpackbits(np.frombuffer(a, np.uint8) ^ np.frombuffer(b, np.uint8)).sum())
+
+
+def apply_masks(pixels, regions):
+    for x, y, width, height in regions:
+        pixels[y:y + height, x:x + width] = 0
+    return pixels
+
+
+def tile_mask(baseline, current, tile=None, threshold=None):
+    """
+    Boolean array with one entry per tile, True where any pixel differs by more than the threshold.
+    """
+    tile = tile or Config.VISUAL_DIFF_TILE
+    threshold = threshold or Config.VISUAL_DIFF_PIXEL_THRESHOLD
+    h, w, _ = baseline.shape
+    pad = ((0, -h % tile), (0, -w % tile), (0, 0))
+    changed = (np.abs(baseline - current) > threshold).any(axis=2)
+    changed = np.pad(changed, pad[:2])
+    rows, cols = changed.shape[0] // tile, changed.shape[1] // tile
+    return changed.reshape(rows, tile, cols, tile).any(axis=(1, 3))
+
+
+def compare(name):
+    """
+    Compare screenshots/<name> with its baseline. Returns a result dict with the fraction of changed tiles.
+    """
+    baseline_path = os.path.join(Config.BASELINE_DIR, name)
+    current_path = os.path.join(Config.SCREENSHOT_DIR, name)
+    result = {"name": name, "changed": 0.0, "hash_distance": 0, "status": "unchanged"}
+    if not os.path.exists(baseline_path):
+        result["status"] = "no baseline"
+        return result
+
+    baseline, current = load(baseline_path), load(current_path)
+    if baseline.shape != current.shape:
+        result.update(changed=1.0, status="size changed")
+        return result
+    if np.array_equal(baseline, current):
+        return result
+
+    regions = Config.VISUAL_DIFF_MASKS.get(os.path.splitext(name)[0], [])
+    baseline, current = apply_masks(baseline, regions), apply_masks(current, regions)
+    mask = tile_mask(baseline, current)
+    result["changed"] = float(mask.mean())
+    result["hash_distance"] = hash_distance(average_hash(baseline), average_hash(current))
+    if mask.any():
+        regressed = (result["changed"] > Config.VISUAL_DIFF_MAX_CHANGED_TILES
+                     or result["hash_distance"] > Config.VISUAL_DIFF_MAX_HASH_DISTANCE)
+        result["status"] = "changed" if regressed else "within tolerance"
+        os.makedirs(Config.DIFF_DIR, exist_ok=True)
+        Image.fromarray(mask).save(os.path.join(Config.DIFF_DIR, f"{os.path.splitext(name)[0]}_mask.png"))
+    return result
+
+
+def screenshot_names():
+    return sorted(name for name in os.listdir(Config.SCREENSHOT_DIR) if name.endswith(IMAGE_EXTENSIONS))
+
+
+def compare_all(names=None, workers=None):
+    """
+    Compare the screenshots in parallel processes. Returns the results of images that regressed.
+    """
+    names = names if names is not None else screenshot_names()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(compare, names, chunksize=max(1, len(names) // 64)))
+    for result in results:
+        logger.info(f"Visual diff {result['name']}: {result['status']} "
+                    f"({result['changed']:.1%} tiles changed, hash distance {result['hash_distance']}).")
+    return [result for result in results if result["status"] in ("changed", "size changed")]
+
+
+def update_baselines(names=None):
+    os.makedirs(Config.BASELINE_DIR, exist_ok=True)
+    for name in names if names is not None else screenshot_names():
+        shutil.copyfile(os.path.join(Config.SCREENSHOT_DIR, name), os.path.join(Config.BASELINE_DIR, name))
+        logger.info(f"Stored baseline for {name}.")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Compare screenshots with their baselines.")
+    parser.add_argument("--update", action="store_true", help="store the current screenshots as baselines")
+    args = parser.parse_args()
+    if args.update:
+        update_baselines()
+    else:
+        sys.exit(1 if compare_all() else 0)
@@ -0,0 +1,179 @@
+# warm_start.py
+# Warm-start mode: instead of a cold page.goto(Config.HOMEPAGE_URL) in every context (new cookies and
+# consent state, empty HTTP cache, every JS bundle downloaded again), contexts start from
+#  - a storage state snapshot saved once after the homepage has loaded, and
+#  - a disk cache of static assets (scripts, stylesheets, fonts, images) served from a route handler.
+# Both live in a directory per site version (its script bundles) under Config.WARM_START_DIR, shared by
+# every worker and context; meta.json points at the current one. A new site version, or a snapshot older
+# than Config.WARM_START_MAX_AGE_S, is written to a new directory and meta.json is switched over, so
+# contexts still using the old one are not broken. Old directories are pruned once past the max age.
+# The asset cache is off in NETWORK_MODE=replay: its misses would go to the network.
+#
+# WARM_START=true pytest tests/test_parameter_apple_search_module.py
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+
+from config.config import Config
+from modules.network_archive import network_mode
+
+logger = logging.getLogger()
+
+# Script bundle URLs change with every site deploy
+SITE_VERSION_JS = "() => Array.from(document.scripts, s => s.src).filter(Boolean).join('|')"
+
+# Headers of the original transfer that do not apply to the stored body
+SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def warm_start_enabled():
+    return os.getenv('WARM_START', 'false').lower() == 'true'
+
+
+def _path(*parts):
+    return os.path.join(Config.WARM_START_DIR, *parts)
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_file = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_file, path)
+
+
+def _read_meta():
+    try:
+        with open(_path("meta.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _is_fresh(saved_at):
+    return time.time() - saved_at < Config.WARM_START_MAX_AGE_S
+
+
+def current_version():
+    """
+    The site version of the current fresh snapshot, or None.
+    """
+    meta = _read_meta()
+    if meta is None or not _is_fresh(meta["saved_at"]):
+        return None
+    if not os.path.exists(_path(meta["site_version"], "storage_state.json")):
+        return None
+    return meta["site_version"]
+
+
+def _prune(keep):
+    """
+    Remove the version directories other than keep that have not been written to for the max age.
+    """
+    for name in os.listdir(Config.WARM_START_DIR):
+        directory = _path(name)
+        if name != keep and os.path.isdir(directory) and not _is_fresh(os.path.getmtime(directory)):
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def context_options():
+    """
+    Extra new_context() arguments: the saved storage state when warm start is on and the snapshot is fresh.
+    """
+    version = current_version() if warm_start_enabled() else None
+    if version is not None:
+        return {"storage_state": _path(version, "storage_state.json")}
+    return {}
+
+
+def site_version(page):
+    return hashlib.sha1(page.evaluate(SITE_VERSION_JS).encode()).hexdigest()[:12]
+
+
+def snapshot(page):
+    """
+    Call once the homepage has loaded: saves the storage state if there is no fresh snapshot of this
+    site version, in the version's own directory, and makes it the current one.
+    """
+    if not warm_start_enabled():
+        return
+    version = site_version(page)
+    current = current_version()
+    if current == version:
+        return
+    if current is not None:
+        logger.info(f"Warm start site version changed from {current} to {version}.")
+    # Written through a per-process temporary file: other workers may be opening contexts from it
+    _write_json(_path(version, "storage_state.json"), page.context.storage_state())
+    _write_json(_path("meta.json"), {"saved_at": time.time(), "site_version": version})
+    _prune(keep=version)
+    logger.info(f"Saved warm start storage state for site version {version}.")
+
+
+class AssetCache:
+    """
+    Route handler serving static assets from disk, fetching and storing them on a miss. Assets are kept
+    in the directory of the current site version and expire after Config.WARM_START_MAX_AGE_S. Until the
+    first snapshot names a version, requests go to the network uncached.
+    """
+
+    def __init__(self, context):
+        self.hits = 0
+        self.misses = 0
+        self.version = None
+        context.route("**/*", self._handle)
+
+    def _entry_path(self, url):
+        return _path(self.version, "assets", hashlib.sha1(url.encode()).hexdigest())
+
+    def _handle(self, route):
+        request = route.request
+        if request.method != "GET" or request.resource_type not in Config.WARM_START_RESOURCE_TYPES:
+            route.fallback()
+            return
+        # A context keeps the version it first saw, so its assets match its storage state
+        self.version = self.version or current_version()
+        if self.version is None:
+            route.fallback()
+            return
+        entry = self._entry_path(request.url)
+        try:
+            with open(f"{entry}.json") as f:
+                meta = json.load(f)
+            if _is_fresh(meta["stored_at"]):
+                with open(entry, 'rb') as f:
+                    body = f.read()
+                self.hits += 1
+                route.fulfill(status=200, headers=meta["headers"], body=body)
+                return
+        except (OSError, ValueError, KeyError):
+            pass
+
+        self.misses += 1
+        response = route.fetch()
+        body = response.body()
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in SKIPPED_HEADERS}
+        if response.status == 200 and "no-store" not in headers.get("cache-control", ""):
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            with open(f"{entry}.{os.getpid()}.tmp", 'wb') as f:
+                f.write(body)
+            os.replace(f"{entry}.{os.getpid()}.tmp", entry)
+            _write_json(f"{entry}.json", {"stored_at": time.time(), "headers": headers})
+        route.fulfill(response=response, headers=headers, body=body)
+
+    def report(self):
+        logger.info(f"Warm start asset cache: {self.hits} hits, {self.misses} misses.")
+
+
+def attach(context):
+    """
+    Serve static assets from the shared disk cache when warm start is on and requests are not replayed
+    from the network archives. Returns the cache, or None.
+    """
+    if not warm_start_enabled() or network_mode() == "replay":
+        return None
+    return AssetCache(context)
@@ -0,0 +1,39 @@
+// Global navigation of the stand-in storefront: Apple logo link and search, as on apple.com
+(function () {
+  var nav = document.createElement("nav");
+  nav.innerHTML =
+    '<a class="globalnav-link globalnav-link-apple" href="/">Apple</a> ' +
+    '<button type="button" aria-label="Search apple.com" id="globalnav-search">Search</button> ' +
+    '<input type="search" placeholder="Search apple.com" id="globalnav-search-input" hidden>';
+  document.body.prepend(nav);
+  var input = nav.querySelector("#globalnav-search-input");
+  nav.querySelector("#globalnav-search").addEventListener("click", function () {
+    input.hidden = false;
+    input.focus();
+  });
+  input.addEventListener("keydown", function (event) {
+    if (event.key === "Enter") {
+      location.href = "/us/search/" + encodeURIComponent(input.value);
+    }
+  });
+})();
+
+// Bag kept in localStorage so it survives navigations within the context
+window.storefrontBag = {
+  items: function () { return JSON.parse(localStorage.getItem("bag") || "[]"); },
+  save: function (items) { localStorage.setItem("bag", JSON.stringify(items)); },
+  add: function (name) { var items = this.items(); items.push(name); this.save(items); },
+  remove: function (name) {
+    var items = this.items();
+    items.splice(items.indexOf(name), 1);
+    this.save(items);
+  }
+};
+
+// Add to Bag: store the product, then reveal the Review Bag button after a short server-like delay
+window.addToBag = function (name) {
+  fetch("/shop/bag/add", { method: "POST", body: name }).then(function () {
+    storefrontBag.add(name);
+    document.getElementById("review-bag").hidden = false;
+  });
+};
@@ -0,0 +1,35 @@
+# Collects the BDD suite in a real pytest run to check the --browser matrix expands every scenario
+# per engine; nothing is executed, so no browser is needed.
+# pytest -v tests/test_browser_matrix.py
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENGINES = ["chromium", "firefox", "webkit"]
+
+
+def collect(*args, **env):
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", "-o", "addopts=", "-p", "no:cacheprovider",
+         "tests/test_parameter_apple_search_module.py", *args],
+        cwd=ROOT, capture_output=True, text=True, timeout=120, env={**os.environ, **env})
+    assert result.returncode == 0, result.stdout + result.stderr
+    return [line for line in result.stdout.splitlines() if "::" in line]
+
+
+def test_every_scenario_runs_once_per_engine():
+    single = collect()
+    matrix = collect(*[arg for engine in ENGINES for arg in ("--browser", engine)])
+    assert len(matrix) == len(ENGINES) * len(single)
+    for engine in ENGINES:
+        assert sum(f"[{engine}" in nodeid for nodeid in matrix) == len(single)
+
+
+def test_parallel_mode_keeps_engines_grouped():
+    matrix = collect("--browser", "chromium", "--browser", "webkit", PARALLEL="true")
+    engines = [nodeid.split("[")[1].split("-")[0].rstrip("]") for nodeid in matrix]
+    # Each engine's tests are contiguous, so worker_browser is launched once per engine
+    assert engines == sorted(engines, key=engines.index)
+    assert set(engines) == {"chromium", "webkit"}
@@ -0,0 +1,160 @@
+# Unit tests for modules/catalog.py: the product lookup and the declarative add-to-bag steps, run
+# against a recording stand-in for the page; no browser needed.
+# pytest -v tests/test_catalog.py
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from config.config import Config
+from modules import readiness
+from modules.catalog import Catalog, normalize
+
+
+def entry(name, steps=None):
+    return {"name": name, "search_link": f"{name} - Apple", "steps": steps or []}
+
+
+@pytest.fixture
+def products():
+    return Catalog([entry("MacBook Pro"), entry("MacBook Air"), entry("iPhone 16 Pro"), entry("iPhone 16 Pro Max")])
+
+
+def test_normalize():
+    assert normalize("iPhone 16  Pro-Max") == "iphone 16 pro max"
+    assert normalize(" MacBook Pro! ") == "macbook pro"
+
+
+def test_exact_lookup_wins_over_longer_names(products):
+    assert products.find("iphone 16 pro").name == "iPhone 16 Pro"
+    assert products.find("IPHONE-16-PRO-MAX").name == "iPhone 16 Pro Max"
+
+
+def test_prefix_lookup_takes_the_shortest_name(products):
+    assert products.find("iPhone 16").name == "iPhone 16 Pro"
+    assert products.find("MacBook").name in ("MacBook Air", "MacBook Pro")
+
+
+def test_substring_lookup(products):
+    assert products.find("16 Pro Max").name == "iPhone 16 Pro Max"
+    assert products.find("Pro Max").name == "iPhone 16 Pro Max"
+
+
+def test_fuzzy_lookup_and_misses(products):
+    assert products.find("MacBok Pro").name == "MacBook Pro"
+    assert products.find("Apple Watch") is None
+    assert products.find("  ") is None
+    with pytest.raises(ValueError):
+        products.get("Apple Watch")
+
+
+class Recorder:
+    """
+    Stands in for a page and its locators, recording every call as a string.
+    """
+
+    def __init__(self, calls=None, prefix="page", is_async=False):
+        self.calls = calls if calls is not None else []
+        self.prefix = prefix
+        self.is_async = is_async
+
+    def _chain(self, method, *args, **kwargs):
+        call = f"{self.prefix}.{method}({', '.join([repr(a) for a in args] + [f'{k}={v!r}' for k, v in kwargs.items()])})"
+        return Recorder(self.calls, call, self.is_async)
+
+    def locator(self, *args, **kwargs):
+        return self._chain("locator", *args, **kwargs)
+
+    def get_by_role(self, *args, **kwargs):
+        return self._chain("get_by_role", *args, **kwargs)
+
+    def get_by_text(self, *args, **kwargs):
+        return self._chain("get_by_text", *args, **kwargs)
+
+    def get_by_label(self, *args, **kwargs):
+        return self._chain("get_by_label", *args, **kwargs)
+
+    def filter(self, *args, **kwargs):
+        return self._chain("filter", *args, **kwargs)
+
+    def nth(self, *args):
+        return self._chain("nth", *args)
+
+    def _act(self, method, **kwargs):
+        self.calls.append(self._chain(method, **kwargs).prefix)
+        if self.is_async:
+            return asyncio.sleep(0)
+
+    def click(self, **kwargs):
+        return self._act("click", **kwargs)
+
+    def wait_for(self, **kwargs):
+        return self._act("wait_for", **kwargs)
+
+    def screenshot(self, **kwargs):
+        self._act("screenshot")
+        return b""
+
+
+STEPS = [
+    {"click": "#noTradeIn_label"},
+    {"click": {"role": "button", "name": "Add to Bag"}},
+    {"click": {"text": "Connect to any carrier later$"}},
+    {"click": {"css": "label", "has_text": "16-inch", "nth": 0}},
+    {"wait": {"label": "Buy, MacBook Pro"}, "budget_ms": 5000},
+]
+
+
+@pytest.fixture
+def readiness_file(tmp_path, monkeypatch):
+    # Waits record their latency; keep it out of the repo's history file
+    monkeypatch.setattr(Config, "READINESS_LATENCY_FILE", str(tmp_path / "latencies.json"))
+    monkeypatch.setattr(readiness, "_latencies", None)
+
+
+EXPECTED = [
+    "page.locator('#noTradeIn_label').click()",
+    "page.get_by_role('button', name='Add to Bag', exact=False).click()",
+    "page.get_by_text('Connect to any carrier later$').click()",
+    "page.locator('label').filter(has_text='16-inch').nth(0).click()",
+    "page.get_by_label('Buy, MacBook Pro').wait_for(state='visible', timeout=10000)",
+    "page.get_by_label('Buy, MacBook Pro').click(trial=True, timeout=10000)",
+]
+
+
+def test_declarative_steps_compile_for_sync_pages(readiness_file, monkeypatch):
+    monkeypatch.setattr(Config, "READINESS_DEFAULT_TIMEOUT_MS", 10000)
+    product = Catalog([entry("MacBook Pro", STEPS)]).get("MacBook Pro")
+    page = Recorder()
+    product.add_to_bag(page)
+    assert page.calls == EXPECTED
+
+
+def test_declarative_steps_compile_for_async_pages(readiness_file, monkeypatch):
+    monkeypatch.setattr(Config, "READINESS_DEFAULT_TIMEOUT_MS", 10000)
+    product = Catalog([entry("MacBook Pro", STEPS)]).get("MacBook Pro")
+    page = Recorder(is_async=True)
+    asyncio.run(product.async_add_to_bag(page))
+    assert page.calls == EXPECTED
+
+
+def test_unknown_step_is_rejected():
+    with pytest.raises(ValueError):
+        Catalog([entry("MacBook Pro", [{"hover": "#x"}])])
+
+
+def test_async_waits_record_latency_off_the_event_loop(readiness_file, monkeypatch):
+    threads = []
+    record_latency = readiness._record_latency
+
+    def record_in_thread(name, duration_ms):
+        threads.append(threading.current_thread())
+        record_latency(name, duration_ms)
+    monkeypatch.setattr(readiness, "_record_latency", record_in_thread)
+    product = Catalog([entry("MacBook Pro", STEPS)]).get("MacBook Pro")
+    asyncio.run(product.async_add_to_bag(Recorder(is_async=True)))
+    assert threads and threading.main_thread() not in threads
+    with open(Config.READINESS_LATENCY_FILE) as f:
+        assert "macbook_pro_wait" in json.load(f)
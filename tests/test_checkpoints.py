@@ -0,0 +1,93 @@
+# Unit tests for modules/checkpoints.py with a stand-in page and a BagWatcher; no browser needed.
+# pytest -v tests/test_checkpoints.py
+
+from types import SimpleNamespace
+
+import pytest
+
+from config.config import Config
+from modules import checkpoints
+from modules.bag_batch import BagWatcher
+
+
+class FakeContext:
+    def storage_state(self):
+        return {"cookies": [{"name": "bag", "value": "1", "domain": "example.com", "path": "/"}], "origins": []}
+
+    def add_cookies(self, cookies):
+        self.cookies = cookies
+
+
+class FakePage:
+    def __init__(self):
+        self.url = "https://example.com/shop/bag"
+        self.context = FakeContext()
+        self.visited = []
+
+    def on(self, event, listener):
+        pass
+
+    def goto(self, url, wait_until=None):
+        self.visited.append(url)
+
+
+@pytest.fixture
+def enabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("CHECKPOINTS", "true")
+    monkeypatch.setattr(Config, "CHECKPOINT_DIR", str(tmp_path))
+    monkeypatch.setattr(checkpoints, "_tracked", {})
+
+
+def run_steps(item, page, steps):
+    checkpoints.start_scenario(item)
+    for step in steps:
+        checkpoints.before_step(page)
+        if not checkpoints.replaying():
+            step()
+        checkpoints.after_step(item.nodeid, step.__name__, page)
+
+
+def test_rerun_restores_the_bag_responses(enabled):
+    item = SimpleNamespace(nodeid="t.py::batch", execution_count=1)
+    page = FakePage()
+    watcher = BagWatcher(page)
+    checkpoints.track("bag_watcher", watcher)
+
+    def add_products_to_bag():
+        watcher.start_batch()
+        watcher.added.extend(["iPhone 16 Pro", "MacBook Pro"])
+
+    def verify_bag_responses():
+        raise AssertionError("flaky")
+
+    checkpoints.start_scenario(item)
+    checkpoints.before_step(page)
+    add_products_to_bag()
+    checkpoints.after_step(item.nodeid, "add_products_to_bag", page)
+    checkpoints.step_failed()
+    checkpoints.finish_scenario(item.nodeid)
+
+    # The retry gets a fresh watcher (function-scoped in parallel mode) that has seen no responses
+    item.execution_count = 2
+    retry_page = FakePage()
+    checkpoints.start_scenario(item)
+    assert checkpoints.replaying()
+    retry_watcher = BagWatcher(retry_page)
+    checkpoints.track("bag_watcher", retry_watcher)
+    assert retry_watcher.added == ["iPhone 16 Pro", "MacBook Pro"]
+    checkpoints.after_step(item.nodeid, "add_products_to_bag", retry_page)  # Skipped step
+    checkpoints.before_step(retry_page)
+    assert retry_page.visited == ["https://example.com/shop/bag"]
+    assert retry_watcher.batch_start == 0
+    retry_watcher.verify(["iPhone 16 Pro", "MacBook Pro"])
+
+
+def test_first_attempt_does_not_resume(enabled):
+    item = SimpleNamespace(nodeid="t.py::single", execution_count=1)
+    page = FakePage()
+    calls = []
+    run_steps(item, page, [lambda: calls.append(1)])
+    checkpoints.step_failed()
+    checkpoints.finish_scenario(item.nodeid)
+    run_steps(item, page, [lambda: calls.append(2)])
+    assert calls == [1, 2]
@@ -0,0 +1,67 @@
+# Unit tests for modules/feature_cache.py on a generated feature file; no browser needed.
+# pytest -v tests/test_feature_cache.py
+
+import pytest
+
+pytest.importorskip("pytest_bdd")
+
+from config.config import Config  # noqa: E402
+from modules import feature_cache  # noqa: E402
+
+ROWS = 250
+
+
+@pytest.fixture
+def feature_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "FEATURE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(feature_cache, "_shard", None)
+    monkeypatch.setattr(feature_cache, "_sharded_features", set())
+    monkeypatch.setattr(feature_cache, "_shard_rows", [])
+    monkeypatch.setattr(feature_cache, "_stats", {"hits": 0, "misses": 0, "saved": 0.0, "rows": 0, "skipped_rows": 0})
+    path = tmp_path / "large.feature"
+    path.write_text(
+        "Feature: Large table\n\n"
+        "  Scenario Outline: Search\n"
+        "    When I search for \"<product>\"\n\n"
+        "  Examples:\n"
+        "    | product |\n"
+        + "".join(f"    | Product {i} |\n" for i in range(ROWS))
+    )
+    return str(path)
+
+
+def rows_of(feature):
+    return [row for scenario in feature.scenarios.values() for row in scenario.examples.examples]
+
+
+def test_cache_round_trip(feature_file):
+    parsed = feature_cache._load(feature_file)
+    cached = feature_cache._load(feature_file)
+    assert feature_cache._stats["misses"] == 1 and feature_cache._stats["hits"] == 1
+    assert cached is not parsed
+    assert list(cached.scenarios) == list(parsed.scenarios)
+    assert rows_of(cached) == rows_of(parsed)
+    assert len(rows_of(cached)) == ROWS
+
+
+def test_split_assigns_every_row_to_one_shard(feature_file):
+    kept = []
+    for index in range(1, 4):
+        feature_cache.set_shard(index, 3)
+        feature = feature_cache._load(feature_file)
+        feature_cache._split_examples(feature)
+        kept.append(rows_of(feature))
+        assert all(feature_cache._in_shard(row) for row in kept[-1])
+    assert sorted(sum(kept, [])) == sorted(rows_of(feature_cache._load(feature_file)))
+    assert [len(rows) for rows in kept] == feature_cache.shard_rows()
+    # A stable hash spreads the rows roughly evenly
+    assert all(ROWS / 3 * 0.7 < len(rows) < ROWS / 3 * 1.3 for rows in kept)
+
+
+def test_small_tables_are_not_split(feature_file, monkeypatch):
+    monkeypatch.setattr(Config, "FEATURE_LAZY_MIN_ROWS", ROWS + 1)
+    feature_cache.set_shard(1, 3)
+    feature = feature_cache._load(feature_file)
+    feature_cache._split_examples(feature)
+    assert len(rows_of(feature)) == ROWS
+    assert feature_cache.shard_rows() == []
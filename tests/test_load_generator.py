@@ -0,0 +1,54 @@
+# Smoke tests of the load generator CLI (modules/load_generator.py) against the stand-in storefront.
+# pytest -v tests/test_load_generator.py
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from modules.load_generator import problems
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_cli(*args, timeout=120):
+    return subprocess.run([sys.executable, "-m", "modules.load_generator", *args], cwd=ROOT,
+                          capture_output=True, text=True, timeout=timeout, env={**os.environ, "HEADLESS": "true"})
+
+
+def test_cli_starts():
+    result = run_cli("--help")
+    assert result.returncode == 0, result.stderr
+    assert "--stages" in result.stdout
+
+
+@pytest.mark.slow
+def test_cli_runs_a_short_stage(tmp_path):
+    report_file = tmp_path / "load_report.json"
+    result = run_cli("--stages", "1", "--stage-seconds", "15", "--products", "MacBook Pro",
+                     "--report-file", str(report_file))
+    assert result.returncode == 0, result.stderr
+    report = json.loads(report_file.read_text())
+    assert report["stages"][0]["users"] == 1
+    assert report["stages"][0]["journeys"] > 0
+    assert report["stages"][0]["journeys_per_minute"] > 0
+    assert sum(interval["passed"] for interval in report["throughput"]) > 0
+    assert report["steps"]["visit_apple_com"]["count"] > 0
+    assert report["problems"] == []
+
+
+def test_problems_fail_runs_without_passed_journeys():
+    report = {"crashes": [], "stages": [{"users": 1, "journeys": 0, "failed": 0},
+                                       {"users": 2, "journeys": 10, "failed": 5},
+                                       {"users": 4, "journeys": 100, "failed": 1}]}
+    assert problems(report) == ["no journey passed with 1 users", "5 of 15 journeys failed with 2 users"]
+    assert problems({"crashes": ["virtual user 0: no browser"], "stages": []}) == ["virtual user 0: no browser"]
+
+
+def test_cli_fails_when_no_journey_passes(tmp_path):
+    # A storefront URL nothing listens on: every journey fails
+    result = run_cli("--stages", "1", "--stage-seconds", "3", "--url", "http://127.0.0.1:9/",
+                     "--report-file", str(tmp_path / "load_report.json"))
+    assert result.returncode == 1
@@ -27,158 +27,205 @@ Key Features:
 """
 
 # Headless mode is set to True and test will run across multiple browsers (Chromium, Firefox, WebKit)
+# Browser matrix: every scenario runs once per --browser, slowest engine's tests scheduled first in parallel mode
+# PARALLEL=true pytest -n auto tests/test_parameter_apple_search_module.py --browser chromium --browser firefox --browser webkit
 # pytest -s -v tests/test_parameter_apple_search_module.py
 # pytest -s -v tests/test_parameter_apple_search_module.py --html=report_playwright_bdd.html
+# Parallel mode: each Examples row gets its own browser context, rows are spread across pytest-xdist workers
+# PARALLEL=true pytest -n auto tests/test_parameter_apple_search_module.py
+# Record traffic once, then replay it offline: NETWORK_MODE=record (one process, without -n) / NETWORK_MODE=replay
+# Start contexts from a saved storage state and cached JS/CSS/fonts/images: WARM_START=true
+# Skip the browser launch by keeping one running between runs: python -m modules.browser_server start
+# Add all products of a row in one session and verify the bag from its network responses: BAG_MODE=batch
+# Retry a failed scenario from its last completed step: CHECKPOINTS=true pytest --reruns 1
 
 
 import logging
 import os
 import pytest
-from playwright.sync_api import Page, Playwright
+from playwright.sync_api import BrowserType, Page
 from pytest_bdd import scenarios, given, when, then, parsers
 from config.config import Config
-from modules.macbook_actions import handle_macbook  # Import MacBook actions
-from modules.iphone_actions import handle_iphone  # Import iPhone actions
-from modules.remove_product_from_bag import handle_remove_product  # Import remove product from bag
-
-# Set up logging with timestamps for detailed logs
-log_file = 'test_results.txt'
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(message)s",  # Include timestamp in the log messages
-    datefmt="%Y-%m-%d %H:%M:%S",  # Format for the timestamp
-    handlers=[
-        logging.FileHandler(log_file, mode='w'),
-        logging.StreamHandler()
-    ]
-)
+from modules import search_flow  # The flow's steps, shared with the benchmarks and the load generator
+from modules.request_tracker import RequestTracker  # Critical-request waits instead of networkidle
+from modules import network_archive  # HAR record/replay selected with NETWORK_MODE
+from modules import resource_policy  # Per-step blocking of media, fonts and trackers
+from modules import instrumentation  # Per-step action timing and network counters
+from modules import warm_start  # Storage state snapshot and shared asset cache, enabled with WARM_START
+from modules.browser_server import connect_or_launch  # Reuse the browser daemon when it is running
+from modules.context_pool import ContextPool  # Reset and reused contexts in parallel mode
+from modules import checkpoints  # Scenario data saved with the step checkpoints
+from modules.checkpoints import resumable  # Reruns resume from the last completed step
+from modules.bag_batch import BagWatcher  # Bag contents checked from the bag add/remove responses
+from modules import feature_cache  # Parsed feature files cached by content hash
+from modules import product_dataset  # Examples rows sampled from an external product dataset
+
+# Logging goes through the queue-based backend set up in conftest.py (modules/run_log.py)
 logger = logging.getLogger()
 
-# Load the feature file
-scenarios('../features/parameter.feature')
+# Step fixtures are only resolved when a step runs, so the scenarios request browser_name themselves;
+# that is what lets pytest-playwright expand them once per --browser
+pytestmark = pytest.mark.usefixtures("browser_name")
+
+# Parallel mode runs the self-contained rows of parameter_parallel.feature, one browser context per row
+PARALLEL = os.getenv('PARALLEL', 'false').lower() == 'true'
+
+# Batch cart mode adds every product of a row in one session and empties the bag in one pass
+BATCH = os.getenv('BAG_MODE', 'single').lower() == 'batch'
+
+# Load the feature file, compiled once per content hash (modules/feature_cache.py)
+if BATCH:
+    FEATURE_FILE = '../features/parameter_batch.feature'
+elif PARALLEL:
+    FEATURE_FILE = '../features/parameter_parallel.feature'
+else:
+    FEATURE_FILE = '../features/parameter.feature'
+# PRODUCT_DATASET=<csv|jsonl> streams the Examples rows from an external dataset instead of the feature file
+feature_cache.prepare(__file__, FEATURE_FILE,
+                      product_dataset.sample_rows() if product_dataset.dataset_applied() else None)
+scenarios(FEATURE_FILE)
 
 # Ensure the screenshots directory exists
 if not os.path.exists('screenshots'):
     os.makedirs('screenshots')
 
 
+def page_scope(fixture_name, config):
+    # Sequential mode shares one page across the ordered scenarios; parallel mode gives each row its own
+    return "function" if PARALLEL else "session"
+
+
 @pytest.fixture(scope="session")
-def browser_setup(playwright: Playwright):
+def worker_browser(browser_type: BrowserType):
     # Check if running in CI/CD environment and set headless mode accordingly
     headless = os.getenv('HEADLESS', 'false').lower() == 'true'
 
-    logger.info(f"Launching browser in {'headless' if headless else 'headed'} mode.")
-    browser = playwright.chromium.launch(headless=headless)  # Set headless mode based on environment
-    context = browser.new_context(viewport={"width": 1920, "height": 1080})
-    page = context.new_page()
-    yield page
-    context.close()
+    # Session scope is per process, so every xdist worker launches one browser
+    logger.info(f"Launching {browser_type.name} in {'headless' if headless else 'headed'} mode.")
+    # browser_type comes from pytest-playwright's --browser option (chromium by default)
+    browser = connect_or_launch(browser_type, headless)  # Set headless mode based on environment
+    yield browser
     browser.close()
 
 
+@pytest.fixture(scope="session")
+def context_pool(worker_browser):
+    # Each worker runs one row at a time, so one pre-warmed context is enough
+    pool = ContextPool(worker_browser, size=1)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope=page_scope)
+def browser_setup(worker_browser, request):
+    # Parallel mode takes each row's context from the worker's pool and resets it afterwards instead of
+    # creating and closing one per row. Warm start needs the snapshot's storage state in a new context.
+    pooled = PARALLEL and not warm_start.warm_start_enabled()
+    if pooled:
+        pool = request.getfixturevalue("context_pool")
+        context = pool.acquire()
+        raw_page = context.pages[0]
+    else:
+        context = worker_browser.new_context(viewport=Config.VIEWPORT, **warm_start.context_options())
+        raw_page = context.new_page()
+    archive = network_archive.attach(context)
+    asset_cache = warm_start.attach(context)
+    policy = resource_policy.attach(context)  # Registered last so it sees requests before the cache and archive
+    page = instrumentation.instrument(raw_page)
+    yield page
+    instrumentation.uninstrument(page)
+    if not pooled:
+        context.close()
+    resource_policy.detach(policy)
+    network_archive.finish(archive)
+    if pooled:  # Listeners removed first so the reset's navigation is not counted
+        report = getattr(request.node, "rep_call", None)
+        pool.release(context, failed=report is None or report.failed)
+    if asset_cache:
+        asset_cache.report()
+
+
+@pytest.fixture(scope=page_scope)
+def request_tracker(browser_setup: Page):
+    tracker = RequestTracker(browser_setup)
+    yield tracker
+    tracker.detach()
+    tracker.report()
+
+
+@pytest.fixture(scope=page_scope)
+def bag_watcher(browser_setup: Page):
+    watcher = BagWatcher(browser_setup)
+    checkpoints.track("bag_watcher", watcher)  # A resumed retry continues with the responses seen so far
+    yield watcher
+    watcher.detach()
+
+
 @given("I am on the Apple homepage")
-def visit_apple_com(browser_setup: Page):
-    page = browser_setup
-    page.goto(Config.HOMEPAGE_URL)
-    page.wait_for_load_state("networkidle")
-    page.screenshot(path='screenshots/homepage.png')
-    logger.info("Visited Apple homepage")
+@resumable
+def visit_apple_com(browser_setup: Page, request_tracker: RequestTracker):
+    search_flow.visit_apple_com(browser_setup, request_tracker)
 
 
 @when(parsers.parse("I search for {product}"))
-def search_for_product(browser_setup: Page, product):
-    logger.info(f"Searching for {product}")
-    page = browser_setup
-    page.wait_for_load_state("networkidle")
-
-    search_button = page.get_by_role("button", name="Search apple.com")
-    search_button.click()
-    search_input = page.get_by_placeholder("Search apple.com")
-    search_input.fill(product)
-    search_input.press("Enter")
-
-    # Wait for search results to load
-    page.wait_for_selector('text="Search Results"', timeout=10000)
-    page.wait_for_load_state("networkidle")
-
-    # Take a screenshot after performing the search
-    product_name_for_file = product.replace('"', '').replace("'", "").replace(" ", "_")
-    page.screenshot(path=f'screenshots/search_results_for_{product_name_for_file}.png')
-
-    # Navigate to the product page based on search results
-    # product_name = ""
-    if "MacBook Pro" in product:
-        product_name = "MacBook Pro - Apple"
-    elif "iPhone" in product:
-        product_name = "iPhone 16 Pro and iPhone 16 Pro Max - Apple"
-    else:
-        raise ValueError(f"Product '{product}' is not handled in the script.")
-
-    # Click the product link
-    page.get_by_role("link", name=product_name, exact=True).click()
-    page.wait_for_timeout(5000)
+@resumable
+def search_for_product(browser_setup: Page, request_tracker: RequestTracker, product):
+    search_flow.search_for_product(browser_setup, request_tracker, product)
 
 
 @when(parsers.parse("I add the first {product} result to the bag"))
+@resumable
 def add_product_to_bag(browser_setup: Page, product):
-    page = browser_setup
-    # product = product
+    search_flow.add_product_to_bag(browser_setup, product)
 
-    if "MacBook Pro" in product:
-        handle_macbook(page)  # Call the function for MacBook
-    elif "iPhone" in product:
-        handle_iphone(page)  # Call the function for iPhone
-    else:
-        raise ValueError(f"Product '{product}' not handled by the script.")
+
+@when(parsers.parse('I add "{products}" to the bag in one session'))
+@resumable
+def add_products_to_bag(browser_setup: Page, request_tracker: RequestTracker, bag_watcher: BagWatcher, products):
+    bag_watcher.start_batch()
+    for product in products.split(","):
+        search_flow.search_for_product(browser_setup, request_tracker, product.strip())
+        search_flow.add_product_to_bag(browser_setup, product.strip())
+
+
+@then(parsers.parse('the bag responses should confirm "{products}"'))
+@resumable
+def verify_bag_responses(bag_watcher: BagWatcher, products):
+    bag_watcher.verify([product.strip() for product in products.split(",")])
 
 
 @then("I should be able to proceed to the review bag")
-def proceed_to_review_bag(browser_setup: Page):
-    page = browser_setup
-    logger.info("Proceeding to review bag.")
-    review_bag_button = page.get_by_role("button", name="Review Bag")
-    review_bag_button.wait_for(state="visible", timeout=5000)
-    review_bag_button.click()
-    page.wait_for_load_state("networkidle")
+@resumable
+def proceed_to_review_bag(browser_setup: Page, request_tracker: RequestTracker):
+    search_flow.proceed_to_review_bag(browser_setup, request_tracker)
 
 
 @then(parsers.parse("a screenshot of the reviewed {product} should be taken"))
-def take_screenshot_of_review(browser_setup: Page, product):
-    page = browser_setup
-    page.wait_for_load_state("networkidle")
-    product_name_for_file = product.replace('"', '').replace("'", "").replace(" ", "_")
-    screenshot_path = f'screenshots/reviewed_{product_name_for_file}.png'
-    page.screenshot(path=screenshot_path)
-    logger.info(f"Screenshot of the reviewed {product} taken at {screenshot_path}.")
-
-    # page.wait_for_timeout(10000)
+@resumable
+def take_screenshot_of_review(browser_setup: Page, request_tracker: RequestTracker, product):
+    search_flow.take_screenshot_of_review(browser_setup, request_tracker, product)
 
 
 @then(parsers.parse('the "{product}" should be removed or deleted from the bag'))
+@resumable
 def remove_product_from_bag(browser_setup: Page, product: str):
-    page = browser_setup
-    handle_remove_product(page, product)  # Pass the product name dynamically
-    page.wait_for_timeout(2000)
+    search_flow.remove_product_from_bag(browser_setup, product)
+
+
+@then("every product should be removed from the bag in one pass")
+@resumable
+def remove_all_products_from_bag(bag_watcher: BagWatcher):
+    bag_watcher.report(bag_watcher.remove_all())
 
 
 @then("I return to the Apple homepage")
-def return_to_homepage(browser_setup: Page):
-    page = browser_setup
-    page.wait_for_load_state("networkidle")
-    try:
-        # Wait for the Apple home page button to be clickable
-        apple_home_page = page.wait_for_selector("a.globalnav-link-apple", state='visible', timeout=20000)
-        # Click the Apple home page button
-        apple_home_page.click()
-        page.wait_for_load_state('load')  # Wait for the page to fully load
-        page.wait_for_timeout(2000)
-    except TimeoutError:
-        # If the link is not clickable, fallback to direct navigation
-        page.goto(Config.HOMEPAGE_URL)
-        page.wait_for_load_state('load')  # Wait for the homepage to load
+@resumable
+def return_to_homepage(browser_setup: Page, request_tracker: RequestTracker):
+    search_flow.return_to_homepage(browser_setup, request_tracker)
 
 
 @then("I close the browser")
+@resumable
 def close_browser(browser_setup: Page):
     logger.info("Closing the browser.")
     # The browser will be closed automatically by the fixture
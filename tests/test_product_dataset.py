@@ -0,0 +1,51 @@
+# Unit tests for the row selection of modules/product_dataset.py; no browser needed.
+# pytest -v tests/test_product_dataset.py
+
+from modules.product_dataset import _from_cursor, _seeded_sample
+
+
+def write_dataset(tmp_path, rows):
+    path = tmp_path / "products.csv"
+    path.write_text("product,family\n" + "".join(f"{product},{family}\n" for product, family in rows))
+    return str(path)
+
+
+def products(rows):
+    return [row["product"] for row in rows]
+
+
+def test_cursor_covers_every_family_and_wraps(tmp_path):
+    # Family B: P0, P3, P6, P9; family A: the other six
+    path = write_dataset(tmp_path, [(f"P{i}", "B" if i % 3 == 0 else "A") for i in range(10)])
+    cursor = {}
+    runs = []
+    for _ in range(4):
+        rows, cursor = _from_cursor(path, 3, cursor)
+        runs.append(products(rows))
+    assert runs[0] == ["P0", "P1", "P2", "P3", "P4", "P6"]
+    assert runs[1] == ["P5", "P7", "P8", "P9", "P0", "P3"]  # B wraps around after P9
+    assert cursor == {"A": 0, "B": 0}
+    # Every row is covered once the cursors have gone round
+    assert set(sum(runs[:2], [])) == {f"P{i}" for i in range(10)}
+
+
+def test_cursor_takes_small_families_whole(tmp_path):
+    path = write_dataset(tmp_path, [("P0", "A"), ("P1", "B"), ("P2", "B")])
+    rows, cursor = _from_cursor(path, 5, {})
+    assert products(rows) == ["P0", "P1", "P2"]
+    assert cursor == {"A": 0, "B": 0}
+
+
+def test_seeded_sample_is_repeatable_and_stratified(tmp_path):
+    path = write_dataset(tmp_path, [(f"P{i}", "AB"[i % 2]) for i in range(20)])
+    sample = _seeded_sample(path, 2, "seed")
+    assert sample == _seeded_sample(path, 2, "seed")
+    assert sorted(row["family"] for row in sample) == ["A", "A", "B", "B"]
+    assert len({frozenset(products(_seeded_sample(path, 2, seed))) for seed in ["a", "b", "c", "d"]}) > 1
+
+
+def test_seeded_sample_does_not_depend_on_row_order(tmp_path):
+    rows = [(f"P{i}", "AB"[i % 2]) for i in range(20)]
+    forward = _seeded_sample(write_dataset(tmp_path, rows), 3, "seed")
+    backward = _seeded_sample(write_dataset(tmp_path, rows[::-1]), 3, "seed")
+    assert sorted(products(forward)) == sorted(products(backward))
@@ -0,0 +1,79 @@
+# Unit tests for modules/request_tracker.py with a stand-in page that replays request events;
+# no browser needed.
+# pytest -v tests/test_request_tracker.py
+
+import pytest
+
+from config.config import Config
+from modules.request_tracker import RequestTracker
+
+
+class FakeRequest:
+    def __init__(self, page, url, navigation=False):
+        self.url = url
+        self.frame = page.main_frame
+        self.navigation = navigation
+
+    def is_navigation_request(self):
+        return self.navigation
+
+
+class FakePage:
+    """
+    Dispatches the queued requests (started and finished) on the first wait_for_timeout poll.
+    """
+
+    main_frame = object()
+
+    def __init__(self):
+        self.listeners = {}
+        self.queued = []
+
+    def on(self, event, listener):
+        self.listeners[event] = listener
+
+    def load(self, *urls):
+        self.queued.extend(urls)
+
+    def wait_for_timeout(self, ms):
+        for index, url in enumerate(self.queued):
+            request = FakeRequest(self, url, navigation=index == 0)
+            self.listeners["request"](request)
+            self.listeners["requestfinished"](request)
+        self.queued = []
+
+
+@pytest.mark.parametrize("url", ["https://www.apple.com/shop/bag", "http://127.0.0.1:5555/shop/bag",
+                                 "https://www.apple.com/shop/bag?product=MX2E3"])
+@pytest.mark.parametrize("step", ["review_bag", "bag_screenshot"])
+def test_bag_steps_become_ready(step, url):
+    page = FakePage()
+    tracker = RequestTracker(page)
+    page.load(url, "https://www.apple.com/ac/globalnav/nav.js")
+    tracker.wait_for(step, timeout=1000)
+    assert [name for name, _, _ in tracker.steps] == [step]
+
+
+def test_every_step_pattern_list_can_be_met():
+    urls = {
+        "homepage": "https://www.apple.com/ac/globalnav/nav.js",
+        "search_ready": "https://www.apple.com/ac/globalnav/nav.js",
+        "search_results": "https://www.apple.com/us/search/iPhone",
+        "review_bag": "https://www.apple.com/shop/bag",
+        "bag_screenshot": "https://www.apple.com/shop/bag",
+        "homepage_return": "https://www.apple.com/ac/globalnav/nav.js",
+    }
+    assert set(urls) == set(Config.CRITICAL_REQUESTS)
+    for step, url in urls.items():
+        page = FakePage()
+        tracker = RequestTracker(page)
+        page.load(url)
+        tracker.wait_for(step, timeout=1000)
+
+
+def test_missing_request_times_out():
+    page = FakePage()
+    tracker = RequestTracker(page)
+    page.load("https://www.apple.com/")
+    with pytest.raises(TimeoutError):
+        tracker.wait_for("review_bag", timeout=200)
@@ -0,0 +1,79 @@
+# Unit tests for modules/shard_planner.py with stub items; no browser needed.
+# pytest -v tests/test_shard_planner.py
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from config.config import Config
+from modules import durations
+from modules.shard_planner import parse_shard, plan, summary
+
+
+def make_item(nodeid, engine=None):
+    callspec = SimpleNamespace(params={"browser_name": engine}) if engine else None
+    return SimpleNamespace(nodeid=nodeid, callspec=callspec, function=None)
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    def write(entries):
+        path = tmp_path / "durations.json"
+        path.write_text(json.dumps({nodeid: {"seconds": seconds, "engine": None}
+                                    for nodeid, seconds in entries.items()}))
+        monkeypatch.setattr(Config, "DURATIONS_FILE", str(path))
+        monkeypatch.setattr(durations, "_history", None)
+    return write
+
+
+def test_parse_shard():
+    assert parse_shard("2/4") == (2, 4)
+    for value in ["0/2", "3/2", "a/b", "1"]:
+        with pytest.raises(ValueError):
+            parse_shard(value)
+
+
+def test_plan_balances_parallel_items(history, monkeypatch):
+    monkeypatch.setenv("PARALLEL", "true")
+    history({"t.py::a": 50, "t.py::b": 30, "t.py::c": 20, "t.py::d": 10})
+    items = [make_item(f"t.py::{name}") for name in "abcd"]
+    shards = plan(items, 2)
+    assert sorted(seconds for seconds, _ in shards) == [50, 60]
+    assert sorted(item.nodeid for _, shard in shards for item in shard) == [item.nodeid for item in items]
+    # Items keep collection order within a shard
+    for _, shard in shards:
+        assert shard == sorted(shard, key=items.index)
+
+
+def test_plan_keeps_files_whole_in_sequential_mode(history, monkeypatch):
+    monkeypatch.setenv("PARALLEL", "false")
+    history({"one.py::a": 10, "one.py::b": 10, "two.py::a": 5})
+    items = [make_item("one.py::a"), make_item("one.py::b"), make_item("two.py::a")]
+    shards = plan(items, 2)
+    assert [[item.nodeid for item in shard] for _, shard in shards] == [["one.py::a", "one.py::b"], ["two.py::a"]]
+
+
+def test_plan_with_more_shards_than_units_leaves_shards_empty(history, monkeypatch):
+    monkeypatch.setenv("PARALLEL", "false")
+    history({})
+    shards = plan([make_item("one.py::a"), make_item("one.py::b")], 2)
+    assert sorted(len(shard) for _, shard in shards) == [0, 2]
+
+
+def test_summary_counts_tests_split_before_expansion(history, monkeypatch):
+    monkeypatch.setenv("PARALLEL", "true")
+    history({"t.py::a": 10, "t.py::b": 10, "t.py::row1": 4, "t.py::row2": 4})
+    shards = plan([make_item("t.py::a"), make_item("t.py::b")], 2)
+    prefiltered = [make_item("t.py::row1"), make_item("t.py::row2")]
+    # This shard (1) got 2 split rows, shard 2 got 3
+    assert summary(shards, 1, prefiltered, [2, 3]) == [(3, 18), (4, 22)]
+    assert summary(shards, 1, [], []) == [(1, 10), (1, 10)]
+
+
+def test_longest_first_keeps_engines_grouped(history):
+    history({"t.py::a[chromium]": 5, "t.py::b[chromium]": 30, "t.py::a[webkit]": 20, "t.py::b[webkit]": 25})
+    items = [make_item(f"t.py::{name}[{engine}]", engine) for name in "ab" for engine in ("chromium", "webkit")]
+    durations.longest_first(items)
+    # WebKit has the larger total, so its tests start first; each engine's slowest test leads
+    assert [item.nodeid for item in items] == ["t.py::b[webkit]", "t.py::a[webkit]", "t.py::b[chromium]", "t.py::a[chromium]"]
@@ -0,0 +1,30 @@
+# Unit tests for modules/stream_report.py fed with pytest TestReport objects; no browser needed.
+# pytest -v tests/test_stream_report.py
+
+import json
+
+from _pytest.reports import TestReport
+
+from modules.stream_report import StreamReport
+
+
+def make_report(nodeid, outcome, when="call", longrepr=None):
+    return TestReport(nodeid, ("t.py", 0, nodeid), {}, outcome, longrepr, when, duration=0.5)
+
+
+def test_reruns_are_counted_and_listed(tmp_path):
+    stream = StreamReport(str(tmp_path), page_size=2)
+    stream.add(make_report("t.py::a", "rerun", longrepr="AssertionError: first attempt"))
+    stream.add(make_report("t.py::a", "passed"))
+    stream.add(make_report("t.py::b", "failed", longrepr="AssertionError: broken"))
+    stream.add(make_report("t.py::c", "passed", when="setup"))  # Passing setup reports are not listed
+    stream.close()
+
+    assert stream.totals == {"passed": 1, "failed": 1, "skipped": 0, "rerun": 1}
+    assert [(page["count"], page["rerun"]) for page in stream.pages] == [(2, 1), (1, 0)]
+    results = [json.loads(line) for line in (tmp_path / "results.jsonl").read_text().splitlines()]
+    assert [result["outcome"] for result in results] == ["rerun", "passed", "failed"]
+    assert "first attempt" in (tmp_path / "page_0001.html").read_text()
+    failures = (tmp_path / "failures.html").read_text()
+    assert "broken" in failures and "first attempt" not in failures
+    assert "1 rerun" in (tmp_path / "index.html").read_text()
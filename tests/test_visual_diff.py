@@ -0,0 +1,77 @@
+# Unit tests for modules/visual_diff.py on generated images; no browser needed.
+# pytest -v tests/test_visual_diff.py
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from config.config import Config
+from modules.visual_diff import average_hash, compare, hash_distance
+
+
+def gradient(width=640, height=640):
+    row = np.linspace(0, 255, width, dtype=np.uint8)
+    return np.repeat(np.tile(row, (height, 1))[:, :, None], 3, axis=2)
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "SCREENSHOT_DIR", str(tmp_path / "screenshots"))
+    monkeypatch.setattr(Config, "BASELINE_DIR", str(tmp_path / "baselines"))
+    monkeypatch.setattr(Config, "DIFF_DIR", str(tmp_path / "diffs"))
+    monkeypatch.setattr(Config, "VISUAL_DIFF_MASKS", {})
+    (tmp_path / "screenshots").mkdir()
+    (tmp_path / "baselines").mkdir()
+
+    def write(name, baseline, current):
+        Image.fromarray(baseline).save(tmp_path / "baselines" / name)
+        Image.fromarray(current).save(tmp_path / "screenshots" / name)
+    return write
+
+
+def test_average_hash_distance():
+    image = gradient().astype(np.int16)
+    assert len(average_hash(image)) == 8
+    assert hash_distance(average_hash(image), average_hash(image.copy())) == 0
+    assert hash_distance(average_hash(image), average_hash(image[:, ::-1])) == 64
+
+
+def test_compare_without_baseline(dirs, tmp_path):
+    Image.fromarray(gradient()).save(tmp_path / "screenshots" / "a.png")
+    assert compare("a.png")["status"] == "no baseline"
+
+
+def test_compare_identical_and_resized(dirs):
+    dirs("a.png", gradient(), gradient())
+    assert compare("a.png")["status"] == "unchanged"
+    dirs("b.png", gradient(), gradient(width=320))
+    assert compare("b.png")["status"] == "size changed"
+
+
+def test_compare_small_change_is_within_tolerance(dirs, tmp_path):
+    current = gradient()
+    current[:10, :10] = 255  # One tile of 400
+    dirs("a.png", gradient(), current)
+    result = compare("a.png")
+    assert result["status"] == "within tolerance"
+    assert result["changed"] == pytest.approx(1 / 400)
+    assert (tmp_path / "diffs" / "a_mask.png").exists()
+
+
+def test_compare_large_change_and_layout_shift(dirs):
+    current = gradient()
+    current[:320] = 0
+    dirs("a.png", gradient(), current)
+    assert compare("a.png")["status"] == "changed"
+    # Mirrored: every tile changes and the hash is inverted
+    dirs("b.png", gradient(), gradient()[:, ::-1].copy())
+    assert compare("b.png")["hash_distance"] == 64
+
+
+def test_masks_are_keyed_by_name_without_extension(dirs, monkeypatch):
+    current = gradient()
+    current[:100] = 0
+    dirs("a.jpg", gradient(), current)
+    assert compare("a.jpg")["status"] == "changed"
+    monkeypatch.setattr(Config, "VISUAL_DIFF_MASKS", {"a": [(0, 0, 640, 100)]})
+    assert compare("a.jpg")["status"] == "unchanged"